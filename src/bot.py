@@ -31,8 +31,21 @@ import os
 import time
 
 from libs import print
+from libs.archean import Archean
+from libs.event_bus import EventBus
+from libs.lifecycle import Lifecycle
+from libs.outbound import OutboundScheduler
+from libs.poller import Poller
+from libs.scheduler import Scheduler
+from libs.loop_lag import LoopLagMonitor
 import libs.json_db as json_db
 
+from models import (
+    Repository,
+    StatisticArchive,
+    SampleWriter
+)
+
 # ---- // Main
 class Bot(commands.AutoShardedBot):
     """
@@ -55,10 +68,62 @@ class Bot(commands.AutoShardedBot):
         
         self.sql_database = sql_database
         self.json_database = json_database
+        self.repository = Repository(
+            sql_database,
+            read_workers = int(os.getenv("sqldb_read_workers")),
+            archive = StatisticArchive(os.getenv("statistics_archive_path")) if os.getenv("statistics_archive_path") else None
+        )
+        
+        self.sample_writer = SampleWriter(
+            repository = self.repository,
+            max_samples = int(os.getenv("statistics_batch_size")),
+            max_delay = float(os.getenv("statistics_batch_delay"))
+        )
+        
+        self.loop_lag = LoopLagMonitor()
         self.started_at = 0
+        
+        self.archean = Archean(
+            connection_limit = int(os.getenv("archean_connection_limit")),
+            dns_cache_ttl = int(os.getenv("archean_dns_cache_ttl")),
+            cache_ttl = float(os.getenv("archean_cache_ttl")),
+            timeout = float(os.getenv("archean_timeout")),
+            retries = int(os.getenv("archean_retries")),
+            retry_delay = float(os.getenv("archean_retry_delay")),
+            breaker_threshold = int(os.getenv("archean_breaker_threshold")),
+            breaker_reset = float(os.getenv("archean_breaker_reset")),
+            stale_ttl = float(os.getenv("archean_stale_ttl"))
+        )
+        
+        self.events = EventBus()
+        self.outbound = OutboundScheduler(
+            max_concurrency = int(os.getenv("outbound_max_concurrency")),
+            interactive_workers = int(os.getenv("outbound_interactive_workers"))
+        )
+        
+        self.scheduler = Scheduler(resolution = float(os.getenv("scheduler_resolution")))
+        
+        self.poller = Poller(
+            archean = self.archean,
+            events = self.events,
+            scheduler = self.scheduler,
+            ip = os.getenv("server_ip").split(":")[0],
+            port = int(os.getenv("server_ip").split(":")[1]),
+            min_interval = float(os.getenv("poller_update_interval")),
+            max_interval = float(os.getenv("poller_max_interval")),
+            backoff = float(os.getenv("poller_backoff")),
+            cache_path = os.getenv("poller_cache_path") or None
+        )
+        
+        if self.poller.load_cache():
+            print.info("Bot", f"Loaded the last server snapshot from {self.poller.cache_path}.")
+
+        self.lifecycle = Lifecycle(max_workers = int(os.getenv("cog_start_workers")))
+        self.lifecycle.add_hooks(pause = self.poller.stop, resume = self.poller.start)
 
         self.ready = False
         self.setup = False
+        self.restart_requested = False
         
     async def setup_activity(self):
         """
@@ -88,6 +153,9 @@ class Bot(commands.AutoShardedBot):
         
         self.setup = True   
         self.started_at = time.time()
+        
+        self.loop_lag.start()
+        self.scheduler.start()
 
         await self.load_cogs()
 
@@ -96,8 +164,73 @@ class Bot(commands.AutoShardedBot):
         Called when the bot is ready.
         """        
         
+        if self.ready: # fired again after reconnects
+            return
+        
         print.success("Bot", f"Bot is online @ {self.user.name} ({self.user.id})")
         self.ready = True
         
         await self.setup_activity()
-        await self.tree.sync()
\ No newline at end of file
+        await self.tree.sync()
+        
+        self.poller.start()
+        
+    async def on_shard_disconnect(self, shard_id: int):
+        """
+        Called when a shard disconnects from Discord.
+        """
+        
+        print.warning("Bot", f"Shard {shard_id} disconnected. Pausing background work.")
+        self.lifecycle.disconnected(shard_id)
+        
+    async def on_shard_resumed(self, shard_id: int):
+        """
+        Called when a shard resumes its session after disconnecting.
+        """
+        
+        self.on_shard_reconnected(shard_id)
+        
+    async def on_shard_ready(self, shard_id: int):
+        """
+        Called when a shard is ready, including after starting a new session because resuming failed.
+        """
+        
+        self.on_shard_reconnected(shard_id)
+        
+    def on_shard_reconnected(self, shard_id: int):
+        """
+        Resumes background work once every disconnected shard is back.
+        
+        Args:
+            shard_id (int): The ID of the shard.
+        """
+        
+        if shard_id not in self.lifecycle.disconnected_shards:
+            return
+        
+        print.info("Bot", f"Shard {shard_id} reconnected.")
+        self.lifecycle.connected(shard_id)
+        
+    async def close(self):
+        """
+        Called when the bot is shutting down.
+        Used to clean up resources, etc.
+        """
+        
+        self.poller.stop()
+        self.scheduler.stop()
+        self.events.close()
+        self.loop_lag.stop()
+        self.lifecycle.close()
+        
+        self.poller.save_cache()
+        
+        # everything is saved before disconnecting, since the event loop can finish as soon as the bot disconnects when this is called from a command (e.g. /restart)
+        await self.sample_writer.close()
+        await self.outbound.stop()
+        await self.archean.close()
+        
+        self.repository.close()
+        self.json_database.close()
+        
+        await super().close()
\ No newline at end of file
@@ -25,19 +25,22 @@ limitations under the License.
 
 # ---- // Imports
 from discord.ext import commands
-import threading
 
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
     from bot import Bot
 
+from libs.scheduler import Job
+
 from abc import abstractmethod
 
 # ---- // Main
 class BaseCog(commands.Cog):
     """
     A base cog class to inherit from.
+    
+    Cogs are started once, on the first `on_ready`. Jobs added with `add_job` are started after `cog_start_async`, stopped while the bot is disconnected from Discord, and started again once it reconnects.
     """
     
     def __init__(self, bot: "Bot"):
@@ -49,14 +52,60 @@ class BaseCog(commands.Cog):
         self.json_db = self.bot.json_database
         self.sql_db = self.bot.sql_database
         
+        self.started = False
+        self.jobs: list[Job] = []
+        
+    def add_job(self, name: str, callback, interval: float, **kwargs) -> Job:
+        """
+        Registers a job with the bot's scheduler, to be started with this cog and paused while the bot is disconnected.
+
+        Args:
+            name (str): The name of the job.
+            callback (Callable[[], Awaitable]): The coroutine function to run.
+            interval (float): How often to run in seconds.
+            **kwargs: Passed to `Scheduler.add_job`.
+
+        Returns:
+            Job: The job.
+        """
+        
+        job = self.bot.scheduler.add_job(name, callback, interval, **kwargs)
+        self.jobs.append(job)
+        
+        return job
+        
     async def start(self):
         """
-        Starts this cog.
+        Starts this cog. Does nothing if already started, since `on_ready` is fired again after reconnects.
         """
         
-        threading.Thread(target = self.cog_start).start()
+        if self.started:
+            return
+        
+        self.started = True
+        
+        self.bot.lifecycle.run_blocking(self.cog_start, name = f"{self.qualified_name}.cog_start")
         await self.cog_start_async()
         
+        self.resume()
+        self.bot.lifecycle.add_hooks(pause = self.pause, resume = self.resume)
+        
+    def pause(self):
+        """
+        Stops this cog's jobs. Runs in progress are left to finish.
+        """
+        
+        for job in self.jobs:
+            job.stop()
+        
+    def resume(self):
+        """
+        Starts this cog's jobs again after being paused.
+        """
+        
+        for job in self.jobs:
+            job.start()
+        
     @commands.Cog.listener("on_ready")
     async def on_ready_listener(self):
         """
@@ -68,7 +117,7 @@ class BaseCog(commands.Cog):
     @abstractmethod
     def cog_start(self):
         """
-        Called when the cog is started (non-async).
+        Called once when the cog is started (non-async). Runs on a shared thread pool.
         """
 
         pass
@@ -76,7 +125,7 @@ class BaseCog(commands.Cog):
     @abstractmethod
     async def cog_start_async(self):
         """
-        Called when the cog is started (async).
+        Called once when the cog is started (async).
         """
         
         pass
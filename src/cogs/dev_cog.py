@@ -27,7 +27,6 @@ limitations under the License.
 import discord
 from discord import app_commands
 import subprocess
-import sys
 
 from cogs.base_cog import BaseCog
 
@@ -53,9 +52,10 @@ class DevCog(BaseCog):
         super().__init__(bot)
         
     # ---- // Methods
-    def restart_bot(self, update: bool = False):
+    async def restart_bot(self, update: bool = False):
         """
         Restarts the bot, updating beforehand if requested.
+        The bot shuts down the same way it normally does, then `main.py` starts the new process.
 
         Args:
             update (bool, optional): Whether or not to update the bot via `git pull`. Defaults to False.
@@ -63,9 +63,9 @@ class DevCog(BaseCog):
        
         if update:
             subprocess.call("git pull")
-           
-        subprocess.Popen([sys.executable, *sys.argv])
-        exit(0)
+        
+        self.bot.restart_requested = True
+        await self.bot.close()
             
     # ---- // Commands
     @app_commands.command(name = "restart")
@@ -82,7 +82,7 @@ class DevCog(BaseCog):
         await checks.bot.ready(interaction)
         await interaction.response.send_message(ephemeral = True, embed = embeds.Success("Restarting..."))
         
-        self.restart_bot(update = update)
+        await self.restart_bot(update = update)
             
 async def setup(bot: "Bot"):
     """
@@ -26,18 +26,23 @@ limitations under the License.
 # ---- // Imports
 import discord
 from discord import app_commands
-from discord.ext.tasks import loop
+import asyncio
 import os
 
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
     from bot import Bot
-    from cogs.status_cog import StatusCog
 
 from cogs.base_cog import BaseCog
 
 from libs import print
+from libs.archean import Server
+
+from libs.poller import (
+    ServerOnline,
+    PlayerCountChanged
+)
 
 from embeds import LiveChat
 
@@ -54,8 +59,17 @@ class LiveChatCog(BaseCog):
         
         super().__init__(bot)
 
-        self.loop = loop(seconds = float(os.getenv("live_chat_update_interval")))(self.check_player_activity)
-        self.previous_player_count = 0
+        self.channel: discord.TextChannel|None = None
+        
+        self.aggregate = os.getenv("live_chat_aggregate").lower() == "yes"
+        self.coalesce_window = float(os.getenv("live_chat_coalesce_window"))
+        
+        self.pending_difference = 0
+        self.pending_server: Server|None = None
+        self.flush_task: asyncio.Task|None = None
+        
+        self.bot.events.subscribe(ServerOnline, self.on_player_count_changed)
+        self.bot.events.subscribe(PlayerCountChanged, self.on_player_count_changed)
 
     # ---- // Callbacks
     async def cog_start_async(self):
@@ -63,9 +77,6 @@ class LiveChatCog(BaseCog):
         Called when the cog starts.
         """
 
-        self.status_cog: "StatusCog" = self.bot.get_cog("StatusCog")
-        self.loop.start()
-        
         try:
             self.channel = self.bot.get_channel(os.getenv("live_chat_channel_id")) or await self.bot.fetch_channel(os.getenv("live_chat_channel_id"))
             
@@ -75,72 +86,124 @@ class LiveChatCog(BaseCog):
             print.error(self.qualified_name, f"Failed to fetch live chat channel: {os.getenv("live_chat_channel_id")}. Err: {exception}")
             return
         
+    async def on_player_count_changed(self, event: ServerOnline|PlayerCountChanged):
+        """
+        Called when the server comes online or its player count changes.
+        The difference is taken from the last player count this cog saw, which is kept across restarts.
+
+        Args:
+            event (ServerOnline|PlayerCountChanged): The event.
+        """        
+        
+        previous_count = self.json_db.get("live_chat_player_count")
+        count = event.server.players
+        
+        if previous_count == count:
+            return
+        
+        self.json_db.set("live_chat_player_count", count)
+        
+        # No saved player count, so there's nothing to compare against
+        if previous_count < 0:
+            return
+        
+        if self.aggregate:
+            self.queue_player_activity(count - previous_count, event.server)
+            return
+        
+        if self.channel is None:
+            return
+        
+        # Detect player join/leave
+        difference = count - previous_count
+        
+        if difference > 0:
+            for i in range(difference):
+                await self.send_player_join_message(previous_count + i + 1, event.server.max_players)
+        elif difference < 0:
+            for i in range(-difference):
+                await self.send_player_leave_message(previous_count - i - 1, event.server.max_players)
+        
     # ---- // Methods
-    async def send_player_join_message(self, count: int, max_players: int):
+    async def send_player_join_message(self, count: int, max_players: int, amount: int = 1):
         """
-        Sends a message to the live chat channel when a player joins.
+        Sends a message to the live chat channel when players join.
 
         Args:
             count (int): The server player count at the time of the join.
             max_players (int): The server max player count.
+            amount (int, optional): The amount of players that joined. Defaults to 1.
         """        
         
         embed = LiveChat(
             title = "Join",
-            text = f"A player joined the server. `{count}/{max_players}` players online.",
+            text = f"{"A player" if amount == 1 else f"`{amount}` players"} joined the server. `{count}/{max_players}` players online.",
             color = (0, 255, 0),
             emoji = "📩"
         )
         
-        await self.channel.send(embed = embed)
+        await self.bot.outbound.send(self.channel, embed = embed)
         
-    async def send_player_leave_message(self, count: int, max_players: int):
+    async def send_player_leave_message(self, count: int, max_players: int, amount: int = 1):
         """
-        Sends a message to the live chat channel when a player leaves.
+        Sends a message to the live chat channel when players leave.
 
         Args:
             count (int): The server player count at the time of the leave.
             max_players (int): The server max player count.
+            amount (int, optional): The amount of players that left. Defaults to 1.
         """
         
         embed = LiveChat(
             title = "Leave",
-            text = f"A player left the server. `{count}/{max_players}` players online.",
+            text = f"{"A player" if amount == 1 else f"`{amount}` players"} left the server. `{count}/{max_players}` players online.",
             color = (255, 0, 0),
             emoji = "📤"
         )
         
-        await self.channel.send(embed = embed)
-    
-    async def check_player_activity(self):
+        await self.bot.outbound.send(self.channel, embed = embed)
+        
+    def queue_player_activity(self, difference: int, server: Server):
+        """
+        Adds a player count difference to the pending live chat message.
+        The message is sent once the coalescing window ends, so joins and leaves within the window are merged into one message.
+
+        Args:
+            difference (int): The player count difference.
+            server (Server): The server as of the difference.
         """
-        Notifies users when the server reaches a player count.
-        """        
         
-        # Get server info
-        try:
-            server = await self.status_cog.fetch_server_information()
-            
-            if server is None:
-                raise Exception("Server is None. Could be offline or unreachable.")
-        except Exception as error:
-            print.error(self.qualified_name, f"Failed to fetch server information: {error}")
-            return
+        self.pending_difference += difference
+        self.pending_server = server
         
-        if server is None:
-            return
+        if self.flush_task is None:
+            self.flush_task = asyncio.create_task(self.flush_player_activity())
         
-        # Detect player join/leave
-        difference = server.players - self.previous_player_count
+    async def flush_player_activity(self):
+        """
+        Sends the pending live chat message after the coalescing window.
+        Nothing is sent if the joins and leaves within the window cancelled out.
+        """
         
-        if difference > 0:
-            for i in range(difference):
-                await self.send_player_join_message(self.previous_player_count + i + 1, server.max_players)
-        elif difference < 0:
-            for i in range(-difference):
-                await self.send_player_leave_message(self.previous_player_count - i - 1, server.max_players)
+        await asyncio.sleep(self.coalesce_window)
+        
+        difference = self.pending_difference
+        server = self.pending_server
+        
+        self.pending_difference = 0
+        self.pending_server = None
+        self.flush_task = None
         
-        self.previous_player_count = server.players
+        if self.channel is None:
+            return
+        
+        try:
+            if difference > 0:
+                await self.send_player_join_message(server.players, server.max_players, amount = difference)
+            elif difference < 0:
+                await self.send_player_leave_message(server.players, server.max_players, amount = -difference)
+        except discord.HTTPException as error:
+            print.error(self.qualified_name, f"Failed to send live chat message: {error}")
             
 async def setup(bot: "Bot"):
     """
@@ -24,21 +24,43 @@ limitations under the License.
 """
 
 # ---- // Imports
-from discord.ext.tasks import loop
+import asyncio
+import discord
+from discord import app_commands
+import io
 import os
+import tempfile
+import time
 
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Literal
 
 if TYPE_CHECKING:
     from bot import Bot
-    from cogs.status_cog import StatusCog
 
 from cogs.base_cog import BaseCog
 
 from libs import print
+from libs.chart import (
+    ChartWindow,
+    render_player_chart
+)
 
+import embeds
+import checks
 import models
 
+from libs.durations import (
+    DAY,
+    WEEK
+)
+
+# ---- // Variables
+CHART_PERIODS = {
+    "24h" : (DAY, models.HourlyStatistic),
+    "7d" : (WEEK, models.HourlyStatistic),
+    "30d" : (DAY * 30, models.DailyStatistic)
+}
+
 # ---- // Main
 class StatisticsCog(BaseCog):
     """
@@ -52,38 +74,202 @@ class StatisticsCog(BaseCog):
         
         super().__init__(bot)
 
-        self.statistics_loop = loop(minutes = float(os.getenv("statistics_update_interval")))(self.update_statistics)
+        self.retention_days = float(os.getenv("statistics_retention_days"))
+        self.hourly_retention_days = float(os.getenv("statistics_hourly_retention_days"))
 
-    # ---- // Callbacks
-    async def cog_start_async(self):
-        """
-        Called when the cog starts.
-        """
+        self.charts: dict[str, tuple[tuple[int, int], asyncio.Task]] = {}
 
-        self.status_cog: "StatusCog" = self.bot.get_cog("StatusCog")
-        self.statistics_loop.start()
+        self.statistics_job = self.add_job(
+            "statistics",
+            self.update_statistics,
+            interval = float(os.getenv("statistics_update_interval")) * 60,
+            group = "server"
+        )
         
+        self.retention_job = self.add_job(
+            "retention",
+            self.apply_retention,
+            interval = 3600,
+            jitter = 60,
+            missed = "coalesce"
+        )
+
     # ---- // Methods
     async def update_statistics(self):
         """
         Updates server statistics.
         """        
         
-        # Get server information
-        try:
-            server = await self.status_cog.fetch_server_information()
+        # Get server information from the latest poll
+        server = self.bot.poller.server
+        
+        if server is None or self.bot.poller.failed:
+            print.error(self.qualified_name, "Failed to update server statistics: Server is offline or unreachable.")
+            return
+        
+        # the last good poll is being reused, so there's nothing new to record
+        if self.bot.poller.stale:
+            return
+        
+        # Update statistics. Written to the database in batches
+        self.bot.sample_writer.add(server)
             
-            if server is None:
-                raise Exception("Server is offline or unreachable.")
+    async def apply_retention(self):
+        """
+        Deletes statistics older than the configured retention periods.
+        """
+        
+        now = time.time()
+        
+        try:
+            archived, deleted, hourly_deleted = await self.bot.repository.prune_statistics(
+                before = now - self.retention_days * 86400 if self.retention_days > 0 else None,
+                hourly_before = now - self.hourly_retention_days * 86400 if self.hourly_retention_days > 0 else None
+            )
         except Exception as error:
-            print.error(self.qualified_name, f"Failed to fetch server information: {error}")
+            print.error(self.qualified_name, f"Failed to apply statistics retention: {error}")
             return
         
-        # Update statistics
+        if deleted > 0 or hourly_deleted > 0:
+            print.info(self.qualified_name, f"Archived {archived} and deleted {deleted} statistics, and deleted {hourly_deleted} hourly summaries past retention.")
+            
+    async def render_chart(self, period: str) -> tuple[bytes, list[models.statistic_rollup.StatisticRollup]]:
+        """
+        Renders a player count chart from the rollups.
+
+        Args:
+            period (str): The period to render, one of `CHART_PERIODS`.
+
+        Returns:
+            tuple[bytes, list[StatisticRollup]]: The chart as a PNG image, and the rollups it was rendered from.
+        """
+        
+        duration, rollup = CHART_PERIODS[period]
+        end = time.time()
+        start = end - duration
+        
+        if rollup is models.DailyStatistic:
+            rollups = await self.bot.repository.get_daily_statistics(start)
+        else:
+            rollups = await self.bot.repository.get_hourly_statistics(start)
+        
+        windows = [
+            ChartWindow(
+                start = max(window.bucket, start),
+                end = window.bucket + window.bucket_size,
+                low = window.min_player_count,
+                average = window.average_player_count,
+                high = window.max_player_count
+            )
+            
+            for window in rollups
+        ]
+        
+        maximum = max([window.peak_max_players for window in rollups] + [window.max_player_count for window in rollups], default = 1)
+        
+        # rendering is CPU-bound, so keep it off the event loop
+        png = await asyncio.to_thread(render_player_chart, windows, start, end, maximum)
+        return png, rollups
+    
+    async def get_chart(self, period: str) -> tuple[bytes, list[models.statistic_rollup.StatisticRollup]]:
+        """
+        Returns a player count chart, rendering it only if new statistics have been written since it was last rendered (or an hour has passed).
+        Concurrent calls share the same render.
+
+        Args:
+            period (str): The period to render, one of `CHART_PERIODS`.
+
+        Returns:
+            tuple[bytes, list[StatisticRollup]]: The chart as a PNG image, and the rollups it was rendered from.
+        """
+        
+        version = (self.bot.sample_writer.batches, int(time.time() // 3600))
+        cached = self.charts.get(period)
+        
+        if cached is None or cached[0] != version:
+            cached = (version, asyncio.create_task(self.render_chart(period)))
+            self.charts[period] = cached
+        
+        try:
+            # shielded so one caller being cancelled doesn't cancel the render for everyone
+            return await asyncio.shield(cached[1])
+        except Exception:
+            # don't cache failures
+            if self.charts.get(period) is cached:
+                self.charts.pop(period)
+                
+            raise
+        
+    # ---- // Commands
+    @app_commands.command(name = "stats")
+    @app_commands.describe(period = "How far back to show statistics for.")
+    async def stats_command(self, interaction: discord.Interaction, period: Literal["24h", "7d", "30d"] = "24h"):
+        """
+        Shows player count statistics with a chart.
+
+        Args:
+            interaction (discord.Interaction): The context of the command.
+            period (Literal["24h", "7d", "30d"], optional): How far back to show statistics for. Defaults to "24h".
+        """
+        
+        await checks.bot.ready(interaction)
+        
         try:
-            models.ServerStatistic.create_from_server(server)
+            png, rollups = await self.get_chart(period)
         except Exception as error:
-            print.error(self.qualified_name, f"Failed to update server statistics: {error}")
+            print.error(self.qualified_name, f"Failed to render statistics chart: {error}")
+            await self.bot.outbound.reply(interaction, ephemeral = True, embed = embeds.Error("Failed to render statistics. Please try again later."))
+            return
+        
+        filename = f"stats_{period}.png"
+        embed = embeds.Statistics(period, rollups, filename)
+        
+        if len(rollups) == 0:
+            await self.bot.outbound.reply(interaction, ephemeral = True, embed = embed)
+            return
+        
+        await self.bot.outbound.reply(interaction, ephemeral = True, embed = embed, file = discord.File(io.BytesIO(png), filename = filename))
+            
+    @app_commands.command(name = "export_stats")
+    @app_commands.default_permissions(administrator = True)
+    @app_commands.describe(format = "The format to export in.", days = "Only export the last this many days. Exports everything if not provided.")
+    async def export_stats_command(self, interaction: discord.Interaction, format: Literal["csv", "jsonl"] = "csv", days: float = None):
+        """
+        Exports server statistics as a gzip-compressed file.
+
+        Args:
+            interaction (discord.Interaction): The context of the command.
+            format (Literal["csv", "jsonl"], optional): The format to export in. Defaults to "csv".
+            days (float, optional): Only export the last this many days. Defaults to None (everything).
+        """
+        
+        await checks.bot.ready(interaction)
+        await self.bot.outbound.defer(interaction, ephemeral = True, thinking = True)
+        
+        # exported to disk rather than memory, so large exports don't use up memory
+        with tempfile.TemporaryFile() as file:
+            try:
+                count = await self.bot.repository.export_statistics(file, format, start = time.time() - days * 86400 if days is not None else None)
+            except Exception as error:
+                print.error(self.qualified_name, f"Failed to export statistics: {error}")
+                await self.bot.outbound.followup(interaction, ephemeral = True, embed = embeds.Error("Failed to export statistics."))
+                return
+            
+            size = file.tell()
+            limit = interaction.guild.filesize_limit if interaction.guild is not None else discord.utils.DEFAULT_FILE_SIZE_LIMIT_BYTES
+            
+            if size > limit:
+                await self.bot.outbound.followup(interaction, ephemeral = True, embed = embeds.Error(f"The export is too large to upload ({size / 1e6:.1f}MB). Use `python export_stats.py` on the bot's host instead, or export fewer days."))
+                return
+            
+            file.seek(0)
+            
+            await self.bot.outbound.followup(
+                interaction,
+                ephemeral = True,
+                embed = embeds.Success(f"Exported `{count}` statistics."),
+                file = discord.File(file, filename = f"statistics.{format}.gz")
+            )
             
 async def setup(bot: "Bot"):
     """
@@ -25,7 +25,6 @@ limitations under the License.
 
 # ---- // Imports
 import discord
-from discord.ext.tasks import loop
 from discord import app_commands
 import os
 
@@ -37,14 +36,27 @@ if TYPE_CHECKING:
 from cogs.base_cog import BaseCog
 
 from libs import print
+from libs.fingerprint import RenderFingerprint
 
 from libs.archean import (
-    Archean,
-    Server
+    Server,
+    CircuitOpen
+)
+
+from libs.poller import (
+    PollFailed,
+    ServerOnline,
+    ServerOffline
 )
 
 import embeds
 import checks
+import models
+
+from libs.durations import (
+    DAY,
+    WEEK
+)
 
 # ---- // Main
 class StatusCog(BaseCog):
@@ -59,11 +71,24 @@ class StatusCog(BaseCog):
         
         super().__init__(bot)
 
-        self.archean = Archean()
+        self.archean = self.bot.archean
         self.server_ip = os.getenv("server_ip").split(":")[0]
         self.server_port = int(os.getenv("server_ip").split(":")[1])
+        self.status_message: discord.Message|None = None
+        self.render = RenderFingerprint(max_age = float(os.getenv("status_force_refresh_interval")))
+        
+        self.bot.events.subscribe(ServerOnline, self.on_server_state_changed)
+        self.bot.events.subscribe(ServerOffline, self.on_server_state_changed)
+        self.bot.events.subscribe(PollFailed, self.on_poll_failed)
         
-        self.status_loop = loop(seconds = float(os.getenv("status_update_interval")))(self.update_status)
+        # grouped with the poller so an update due at the same time as a poll runs after it
+        self.status_job = self.add_job(
+            "status",
+            self.update_status,
+            interval = float(os.getenv("status_update_interval")),
+            deadline = float(os.getenv("status_update_interval")),
+            group = "server"
+        )
 
     # ---- // Callbacks
     async def cog_start_async(self):
@@ -90,8 +115,32 @@ class StatusCog(BaseCog):
             self.status_message = await self.status_channel.send(embed = embeds.Info("Setting up..."))
             self.json_db.set("status_message_id", self.status_message.id)
             
-        # Start loop
-        self.status_loop.start()
+        # Show the last known status straight away (e.g. loaded from before a restart) instead of waiting for the next update
+        await self.update_status()
+        
+    async def on_server_state_changed(self, event: ServerOnline|ServerOffline):
+        """
+        Called when the server comes online or goes offline.
+        Updates the status message straight away instead of waiting for the next scheduled update.
+
+        Args:
+            event (ServerOnline|ServerOffline): The event.
+        """
+        
+        await self.update_status()
+        
+    async def on_poll_failed(self, event: PollFailed):
+        """
+        Called when the poller fails to fetch server information.
+
+        Args:
+            event (PollFailed): The event.
+        """
+        
+        if isinstance(event.error, CircuitOpen): # already logged once when requests were paused
+            return
+        
+        print.error(self.qualified_name, f"Failed to fetch server information: {event.error}")
         
     # ---- // Methods
     async def fetch_server_information(self) -> Server|None:
@@ -109,16 +158,32 @@ class StatusCog(BaseCog):
         Updates server status.
         """        
         
-        # Get server information
-        try:
-            server = await self.fetch_server_information()
-        except Exception as error:
-            print.error(self.qualified_name, f"Failed to fetch server information: {error}")
-            server = None
+        if self.status_message is None:
+            return
+        
+        # Wait for the first poll so the server isn't briefly shown as offline
+        if not self.bot.poller.polled and not self.bot.poller.failed:
+            return
+        
+        # Get server information from the latest poll
+        server = None if self.bot.poller.failed else self.bot.poller.server
+        
+        # Skip the edit if the message would look the same
+        embed = embeds.Server(
+            server,
+            peak = models.peak_cache.get_peak(),
+            daily_peak = models.peak_cache.get_peak(DAY),
+            weekly_peak = models.peak_cache.get_peak(WEEK),
+            stale_since = self.bot.poller.fetched_at if self.bot.poller.stale else None
+        )
+        
+        if not self.render.should_edit(embed):
+            return
         
         # Edit message
         try:
-            await self.status_message.edit(embed = embeds.Server(server))
+            await self.bot.outbound.edit(self.status_message, embed = embed)
+            self.render.record(embed)
         except discord.HTTPException as error:
             print.error(self.qualified_name, f"Failed to update server status message: {error}")
             
@@ -135,7 +200,7 @@ class StatusCog(BaseCog):
         await checks.bot.ready(interaction)
         
         server = await self.fetch_server_information()
-        await interaction.response.send_message(ephemeral = True, embed = embeds.CompactServer(server))
+        await self.bot.outbound.reply(interaction, ephemeral = True, embed = embeds.CompactServer(server))
         
     @app_commands.command(name = "online")
     async def online_command(self, interaction: discord.Interaction):
@@ -151,9 +216,9 @@ class StatusCog(BaseCog):
         server = await self.fetch_server_information()
         
         if server is not None:
-            await interaction.response.send_message(ephemeral = True, embed = embeds.Info(f"🟢 | The server is online."))
+            await self.bot.outbound.reply(interaction, ephemeral = True, embed = embeds.Info(f"🟢 | The server is online."))
         else:
-            await interaction.response.send_message(ephemeral = True, embed = embeds.Error("🔴 | The server is offline."))
+            await self.bot.outbound.reply(interaction, ephemeral = True, embed = embeds.Error("🔴 | The server is offline."))
             
 async def setup(bot: "Bot"):
     """
@@ -26,8 +26,9 @@ limitations under the License.
 # ---- // Imports
 import discord
 from discord import app_commands
-from discord.ext.tasks import loop
+import asyncio
 import os
+import time
 
 from typing import TYPE_CHECKING
 
@@ -39,6 +40,12 @@ from cogs.base_cog import BaseCog
 
 from libs import print
 from libs import timestamp
+from libs.archean import Server
+
+from libs.poller import (
+    ServerOnline,
+    PlayerCountChanged
+)
 
 import checks
 import embeds
@@ -56,60 +63,147 @@ class WaitingListCog(BaseCog):
         """        
         
         super().__init__(bot)
-
-        self.notify_loop = loop(seconds = float(os.getenv("waiting_list_update_interval")))(self.notify)
+        
+        self.waitees = models.WaiteeIndex()
+        self.player_count: int|None = self.bot.poller.last_online.players if self.bot.poller.last_online is not None else None # from before a restart, if saved
+        self.semaphore = asyncio.Semaphore(int(os.getenv("waiting_list_concurrency")))
+        self.proximity = int(os.getenv("waiting_list_proximity"))
+        self.notify_tasks: set[asyncio.Task] = set()
+        
+        self.bot.events.subscribe(ServerOnline, self.on_player_count_changed)
+        self.bot.events.subscribe(PlayerCountChanged, self.on_player_count_changed)
+        self.bot.poller.add_hint(self.has_waitees_near)
 
     # ---- // Callbacks
+    async def cog_load(self):
+        """
+        Called when the cog is loaded. Loads pending waitees into the index.
+        """
+        
+        self.waitees.load(await self.bot.repository.get_waitees())
+        
+    async def cog_unload(self):
+        """
+        Called when the cog is unloaded (e.g. on shutdown). Cancels reminders still being sent.
+        """
+        
+        for task in list(self.notify_tasks):
+            task.cancel()
+        
     async def cog_start_async(self):
         """
         Called when the cog starts.
         """
 
         self.status_cog: "StatusCog" = self.bot.get_cog("StatusCog")
-        self.notify_loop.start()
         
-    # ---- // Methods
-    async def notify(self):
+    async def on_player_count_changed(self, event: ServerOnline|PlayerCountChanged):
         """
-        Notifies users when the server reaches a player count.
-        """        
+        Called when the server comes online or its player count changes.
+
+        Args:
+            event (ServerOnline|PlayerCountChanged): The event.
+        """
+        
+        previous_count = self.player_count
+        self.player_count = event.server.players
+        
+        if previous_count is None: # nothing to compare against (e.g. just started), so only check the current count
+            waitees = self.waitees.pop_reached(self.player_count)
+        else:
+            waitees = self.waitees.pop_crossed(previous_count, self.player_count)
+        
+        if len(waitees) == 0:
+            return
         
-        # Get server info
+        # deleted before anything else is awaited, so the deletion is queued ahead of any new /wait from these users and the database never holds records the index has dropped
         try:
-            server = await self.status_cog.fetch_server_information()
+            await self.bot.repository.delete_waitees([waitee.id for waitee in waitees])
         except Exception as error:
-            print.error(self.qualified_name, f"Failed to fetch server information: {error}")
+            print.error(self.qualified_name, f"Failed to delete waitee records, keeping them for next time: {error}")
+            
+            for waitee in waitees:
+                self.waitees.add(waitee)
+                
             return
         
-        if server is None:
-            return
+        # sent in the background so a large batch doesn't hold up later events
+        task = asyncio.create_task(self.notify(waitees))
+        
+        self.notify_tasks.add(task)
+        task.add_done_callback(self.notify_tasks.discard)
+        
+    # ---- // Methods
+    def has_waitees_near(self, server: Server) -> bool:
+        """
+        Returns whether or not anyone is waiting for a player count close to the server's, so the poller keeps checking quickly.
+
+        Args:
+            server (Server): The polled server.
+
+        Returns:
+            bool: True if anyone is close to being reminded.
+        """
+        
+        return self.waitees.has_target_near(server.players, self.proximity)
+        
+    async def remind(self, waitee: models.Waitee) -> bool:
+        """
+        Sends a reminder to a waitee through DMs, falling back to the channel they used `/wait` in.
+
+        Args:
+            waitee (models.Waitee): The waitee to remind.
+
+        Returns:
+            bool: Whether or not the reminder was sent.
+        """
         
-        # Find Waitees for server's player count
-        for waitee in models.Waitee.get_waitees_for_player_count(server.players):
+        async with self.semaphore:
+            user = await waitee.get_user(self.bot)
+            
             try: # send to dms
-                user = await waitee.get_user(self.bot)
                 dm_channel = user.dm_channel or await user.create_dm()
+                await self.bot.outbound.send(dm_channel, embed = embeds.WaiteeReminder(waitee))
                 
-                await dm_channel.send(embed = embeds.WaiteeReminder(waitee))
-            except Exception as error: # failed to send to dms, fallback to channel
+                return True
+            except Exception: # failed to send to dms, fallback to channel
                 try:
-                    user = await waitee.get_user(self.bot)
                     channel = await waitee.get_fallback_channel(self.bot)
-                    await channel.send(content = user.mention, embed = embeds.WaiteeReminder(waitee, used_fallback = True))
+                    await self.bot.outbound.send(channel, content = f"<@{waitee.user_id}>", embed = embeds.WaiteeReminder(waitee, used_fallback = True))
+                    
+                    return True
                 except Exception as error:
-                    print.error(self.qualified_name, f"Failed to send waitee reminder to {user}: {error}")
+                    print.error(self.qualified_name, f"Failed to send waitee reminder to {user or waitee.user_id}: {error}")
+                    return False
+    
+    async def notify(self, waitees: list[models.Waitee]):
+        """
+        Notifies waitees that the server reached the player count they wanted.
+        Reminders are sent concurrently. The waitee records must already be deleted.
 
-            waitee.delete_instance()
+        Args:
+            waitees (list[models.Waitee]): The waitees to notify.
+        """        
+        
+        if len(waitees) == 0:
+            return
+        
+        started_at = time.perf_counter()
+        results = await asyncio.gather(*[self.remind(waitee) for waitee in waitees])
+        
+        print.info(self.qualified_name, f"Sent {sum(results)}/{len(waitees)} waitee reminders in {time.perf_counter() - started_at:.2f}s.")
             
      # ---- // Commands
     @app_commands.command(name = "wait")
-    async def status_command(self, interaction: discord.Interaction, player_count: int):
+    @app_commands.describe(at_least = "Remind you once the player count is at least this, rather than exactly this.")
+    async def status_command(self, interaction: discord.Interaction, player_count: int, at_least: bool = False):
         """
         Sets you up to be notified when the server reaches a player count.
 
         Args:
             interaction (discord.Interaction): The context of the command.
             player_count (int): The player count to wait for.
+            at_least (bool, optional): Whether to be notified once the player count is at least `player_count`, rather than exactly. Defaults to False.
         """
         
         # Checks
@@ -119,44 +213,53 @@ class WaitingListCog(BaseCog):
         server = await self.status_cog.fetch_server_information()
         
         if player_count <= 0 or player_count > server.max_players:
-            await interaction.response.send_message(ephemeral = True, embed = embeds.Error(f"The player count provided is invalid. Keep it between `1-{server.max_players}`."))
+            await self.bot.outbound.reply(interaction, ephemeral = True, embed = embeds.Error(f"The player count provided is invalid. Keep it between `1-{server.max_players}`."))
             return
         
         # Check if the player count is already reached
-        if player_count == server.players:
-            await interaction.response.send_message(ephemeral = True, embed = embeds.Error(f"The player count is already `{player_count}`."))
+        if player_count == server.players or (at_least and server.players >= player_count):
+            await self.bot.outbound.reply(interaction, ephemeral = True, embed = embeds.Error(f"The player count is already {"at least " if at_least else ""}`{player_count}`."))
             return
         
+        target = f"{"at least " if at_least else ""}`{player_count}`"
+        
         # Check if the user already has a waitee
-        waitee = models.Waitee.get_waitee(interaction.user)
+        waitee = self.waitees.get(interaction.user.id)
         
         if waitee is not None:    
             # No point in modifying, user is already waiting for the same player count 
-            if waitee.wants_player_count == player_count:
-                await interaction.response.send_message(ephemeral = True, embed = embeds.Error("You are already waiting for this player count."))
+            if waitee.wants_player_count == player_count and waitee.at_least == at_least:
+                await self.bot.outbound.reply(interaction, ephemeral = True, embed = embeds.Error("You are already waiting for this player count."))
                 return
             
             # Update
+            previous_player_count, previous_at_least = waitee.wants_player_count, waitee.at_least
             waitee.wants_player_count = player_count
+            waitee.at_least = at_least
             
             try:
-                waitee.save()
+                await self.bot.repository.save(waitee)
             except:
-                await interaction.response.send_message(ephemeral = True, embed = embeds.Error("Failed to update your reminder."))
+                waitee.wants_player_count, waitee.at_least = previous_player_count, previous_at_least
+                await self.bot.outbound.reply(interaction, ephemeral = True, embed = embeds.Error("Failed to update your reminder."))
                 return
+            
+            self.waitees.add(waitee)
 
             # Notify
-            await interaction.response.send_message(ephemeral = True, embed = embeds.Success(f"You will now be notified when the server reaches a player count of `{player_count}`.\nNote that you just modified your existing reminder, so you will not be notified for the old player count.\nUse `/dismiss` to cancel."))
+            await self.bot.outbound.reply(interaction, ephemeral = True, embed = embeds.Success(f"You will now be notified when the server reaches a player count of {target}.\nNote that you just modified your existing reminder, so you will not be notified for the old player count.\nUse `/dismiss` to cancel."))
             return
         
         # Create new waitee
         try:
-            waitee = models.Waitee.wait_for_count(interaction.user, player_count, interaction.channel)
+            waitee = await self.bot.repository.create_waitee(interaction.user, player_count, interaction.channel, at_least = at_least)
         except:
-            await interaction.response.send_message(ephemeral = True, embed = embeds.Error("Failed to create a reminder."))
+            await self.bot.outbound.reply(interaction, ephemeral = True, embed = embeds.Error("Failed to create a reminder."))
             return
+        
+        self.waitees.add(waitee)
             
-        await interaction.response.send_message(ephemeral = True, embed = embeds.Success(f"You will now be notified when the server reaches a player count of `{player_count}`.\nUse `/dismiss` to cancel."))
+        await self.bot.outbound.reply(interaction, ephemeral = True, embed = embeds.Success(f"You will now be notified when the server reaches a player count of {target}.\nUse `/dismiss` to cancel."))
         
     @app_commands.command(name = "dismiss")
     async def dismiss_command(self, interaction: discord.Interaction):
@@ -171,15 +274,22 @@ class WaitingListCog(BaseCog):
         await checks.bot.ready(interaction)
         
         # Get waitee
-        waitee = models.Waitee.get_waitee(interaction.user)
+        waitee = self.waitees.get(interaction.user.id)
         
         if waitee is None:
-            await interaction.response.send_message(ephemeral = True, embed = embeds.Error("You are not currently waiting. Use `/wait` to set up a reminder."))
+            await self.bot.outbound.reply(interaction, ephemeral = True, embed = embeds.Error("You are not currently waiting. Use `/wait` to set up a reminder."))
             return
         
         # Remove waitee record
-        await interaction.response.send_message(ephemeral = True, embed = embeds.Success(f"You will no longer be notified when the server reaches a player count of `{waitee.wants_player_count}`."))
-        waitee.delete_instance()
+        try:
+            await self.bot.repository.delete(waitee)
+        except:
+            await self.bot.outbound.reply(interaction, ephemeral = True, embed = embeds.Error("Failed to cancel your reminder."))
+            return
+        
+        self.waitees.remove(interaction.user.id)
+        
+        await self.bot.outbound.reply(interaction, ephemeral = True, embed = embeds.Success(f"You will no longer be notified when the server reaches a player count of {"at least " if waitee.at_least else ""}`{waitee.wants_player_count}`."))
             
 async def setup(bot: "Bot"):
     """
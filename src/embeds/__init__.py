@@ -31,4 +31,5 @@ from .error import Error
 from .success import Success
 from .server import Server
 from .waitee_reminder import WaiteeReminder
-from .live_chat import LiveChat
\ No newline at end of file
+from .live_chat import LiveChat
+from .statistics import Statistics
\ No newline at end of file
@@ -65,4 +65,22 @@ class Bot(discord.Embed):
         self.add_field(name = "Memory Usage", value = f"{memory_usage:.1f}MB", inline = True)
         self.add_field(name = "CPU Usage", value = f"{cpu_usage_percent:.1f}%", inline = True)
         self.add_field(name = "Uptime", value = f"{uptime_formatted}", inline = True)
+        
+        status_cog = bot.get_cog("StatusCog")
+        
+        if status_cog is not None:
+            self.add_field(name = "Status Edits", value = f"{status_cog.render.performed} sent, {status_cog.render.skipped} skipped", inline = True)
+        
+        self.add_field(name = "Event Loop Lag", value = f"{bot.loop_lag.average * 1000:.1f}ms avg, {bot.loop_lag.max * 1000:.1f}ms max", inline = True)
+        self.add_field(name = "Outbound Queue", value = f"{bot.outbound.queue_depth} queued, {bot.outbound.average_wait:.2f}s avg wait", inline = True)
+        
+        self.add_field(name = "Polling", value = f"Every {bot.poller.interval:.1f}s ({bot.poller.min_interval:g}-{bot.poller.max_interval:g}s), {bot.poller.polls_per_minute:.1f}/min", inline = True)
+        
+        jobs = "\n".join(
+            f"`{name}`: {metrics.average_run_time * 1000:.0f}ms avg run, {metrics.average_lateness * 1000:.0f}ms avg late, {metrics.skipped} skipped"
+            for name, metrics in bot.scheduler.get_metrics().items()
+        )
+        
+        self.add_field(name = "Scheduled Jobs", value = jobs or "None", inline = False)
+        
         self.add_field(name = "Source Code", value = f"[**Click Here**]({os.getenv("github_repo_url")})", inline = False)
\ No newline at end of file
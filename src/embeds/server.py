@@ -40,19 +40,21 @@ class Server(discord.Embed):
     An embed displaying information on a server.
     """
     
-    def __init__(self, server: ArcheanServer|None):
+    def __init__(self, server: ArcheanServer|None, peak: models.ServerStatistic|None, daily_peak: models.ServerStatistic|None = None, weekly_peak: models.ServerStatistic|None = None, stale_since: float|None = None):
         """
         An embed displaying information on a server.
 
         Args:
             server (ArcheanServer|None): The server to show information on.
+            peak (models.ServerStatistic|None): The record with the server's highest player count.
+            daily_peak (models.ServerStatistic|None, optional): The record with the server's highest player count in the last 24 hours. Defaults to None.
+            weekly_peak (models.ServerStatistic|None, optional): The record with the server's highest player count in the last 7 days. Defaults to None.
+            stale_since (float|None, optional): When the shown information was fetched, if it is out of date (e.g. the Archean API can't be reached). Defaults to None.
         """
         
         super().__init__()
         
         if server:
-            peak = models.ServerStatistic.get_peak_player_count()
-            
             if peak is None:
                 self.title = "Error"
                 self.description = "No server statistics. This should fix itself on its own."
@@ -77,6 +79,9 @@ class Server(discord.Embed):
                 f"🔥 | **Peak: {timestamp(peak.time, "R")} with** `{peak.player_count}/{peak.max_players}` **players.**"
             ])
             
+            if daily_peak is not None and weekly_peak is not None:
+                self.description += f"\n📈 | **24h Peak:** `{daily_peak.player_count}/{daily_peak.max_players}` • **7d Peak:** `{weekly_peak.player_count}/{weekly_peak.max_players}`"
+            
             self.color = discord.Color.from_rgb(125, 200, 125)
             
             self.set_footer(text = f"Server Version: v{server.version}")
@@ -86,4 +91,7 @@ class Server(discord.Embed):
             self.description = f"⛔ | The server is offline."
             self.color = discord.Color.red()
             
+        if stale_since is not None:
+            self.description += f"\n⚠️ | **Out of date, last updated {timestamp(stale_since, "R")}.**"
+            
         self.description += f"\n-# Refreshes every {float(os.getenv("status_update_interval")):.1f} seconds"
\ No newline at end of file
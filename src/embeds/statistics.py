@@ -0,0 +1,69 @@
+# // ---------------------------------------------------------------------
+# // ------- [Embeds] Statistics
+# // ---------------------------------------------------------------------
+
+"""
+An embed showing server statistics over a period of time.
+Repo: https://github.com/cuhHub/ArcheanBot
+
+---
+
+Copyright (C) 2024 Cuh4
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+# ---- // Imports
+import discord
+
+import models
+
+from libs.timestamp import timestamp
+
+# ---- // Main
+class Statistics(discord.Embed):
+    """
+    An embed showing server statistics over a period of time.
+    """
+
+    def __init__(self, period: str, rollups: list[models.statistic_rollup.StatisticRollup], chart_filename: str):
+        """
+        An embed showing server statistics over a period of time.
+
+        Args:
+            period (str): The period of time, e.g. "24h".
+            rollups (list[models.statistic_rollup.StatisticRollup]): The rollups within the period, oldest first.
+            chart_filename (str): The filename of the attached chart.
+        """
+
+        super().__init__()
+
+        self.title = f"📊 | Player Count • Last {period}"
+        self.color = discord.Color.from_rgb(125, 200, 125)
+
+        if len(rollups) == 0:
+            self.description = "No statistics have been recorded for this period yet."
+            return
+
+        peak = max(rollups, key = lambda rollup: rollup.max_player_count)
+        low = min(rollup.min_player_count for rollup in rollups)
+        average = sum(rollup.total_player_count for rollup in rollups) / sum(rollup.samples for rollup in rollups)
+
+        self.description = "\n".join([
+            f"🔥 | **Peak:** `{peak.max_player_count}/{peak.peak_max_players}` {timestamp(peak.peak_time, "R")}",
+            f"👥 | **Average:** `{average:.1f}`",
+            f"📉 | **Low:** `{low}`",
+            "-# The line is the average player count, and the shaded area is the range between the lowest and highest."
+        ])
+
+        self.set_image(url = f"attachment://{chart_filename}")
@@ -46,7 +46,7 @@ class WaiteeReminder(Success):
         super().__init__(
             title = "Reminder",
             text = "\n".join([
-                f"**The server has reached a player count of `{waitee.wants_player_count}`**.",
+                f"**The server has reached {"at least " if waitee.at_least else ""}a player count of `{waitee.wants_player_count}`**.",
                 "You will not be reminded again unless you use `/wait` again.",
                 "",
                 "-# This message was sent because you wanted to be notified about this " + timestamp.timestamp(waitee.start_time, "R") + "."
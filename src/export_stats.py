@@ -0,0 +1,67 @@
+# // ---------------------------------------------------------------------
+# // ------- cuhHub Archean Bot - Statistics Export
+# // ---------------------------------------------------------------------
+
+"""
+Exports server statistics to a gzip-compressed CSV or JSONL file.
+Run from the `src` directory, e.g. `py export_stats.py statistics.csv.gz --days 30`. Safe to run while the bot is running.
+Repo: https://github.com/cuhHub/ArcheanBot
+
+---
+
+Copyright (C) 2024 Cuh4
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+# ---- // Imports
+import argparse
+import os
+import peewee
+import time
+from dotenv import load_dotenv
+
+import models
+import libs.print as print
+from models.statistic_export import (
+    FORMATS,
+    export_statistics
+)
+
+# ---- // Main
+# Load .env
+load_dotenv()
+
+# Arguments
+parser = argparse.ArgumentParser(description = "Exports server statistics to a gzip-compressed CSV or JSONL file.")
+parser.add_argument("output", help = "The file to write to, e.g. statistics.csv.gz")
+parser.add_argument("--format", choices = FORMATS, default = "csv", help = "The format to export in. Defaults to csv.")
+parser.add_argument("--days", type = float, default = None, help = "Only export the last this many days. Exports everything if not provided.")
+arguments = parser.parse_args()
+
+# Open the databases. Only read from, so migrations are left to the bot
+models.proxy.initialize(peewee.SqliteDatabase(os.getenv("sqldb_path"), pragmas = {"journal_mode" : "wal"}))
+archive = models.StatisticArchive(os.getenv("statistics_archive_path")) if os.getenv("statistics_archive_path") else None
+
+# Export
+started_at = time.time()
+
+with open(arguments.output, "wb") as file:
+    count = export_statistics(
+        file,
+        arguments.format,
+        start = started_at - arguments.days * 86400 if arguments.days is not None else None,
+        archive = archive
+    )
+
+print.success("Export", f"Exported {count} statistics to {arguments.output} in {time.time() - started_at:.2f}s.")
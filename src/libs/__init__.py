@@ -25,7 +25,16 @@ limitations under the License.
 
 # ---- // Imports
 from libs import archean
+from libs import chart
+from libs import durations
+from libs import event_bus
+from libs import fingerprint
+from libs import lifecycle
+from libs import loop_lag
+from libs import outbound
+from libs import poller
 from libs import json_db
 from libs import print
+from libs import scheduler
 from libs import timestamp
 from libs import server
\ No newline at end of file
@@ -28,7 +28,10 @@ from .exceptions import *
 
 from .enums import *
 
+from .circuit_breaker import CircuitBreaker
+
 from .archean import (
     Server,
+    ServerSnapshot,
     Archean
 )
\ No newline at end of file
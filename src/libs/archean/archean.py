@@ -28,12 +28,18 @@ from __future__ import annotations
 
 import os
 import aiohttp
+import asyncio
 import json
-from dataclasses import dataclass
+import random
+import time
+from dataclasses import dataclass, field, replace
+
+from libs import print
 
 # Exceptions
 from . import (
     RequestFailure,
+    CircuitOpen,
     InvalidJSON,
     InvalidSchema
 )
@@ -44,51 +50,268 @@ from . import (
     PasswordProtected
 )
 
+from .circuit_breaker import CircuitBreaker
+
+# ---- // Variables
+TRANSIENT_STATUSES = {408, 429, 500, 502, 503, 504} # worth retrying, the next attempt may succeed
+
 # ---- // Main
 class Archean():
     """
     A class for interacting with Archean's web API.
     
-    >>> archean = Archean()
-    >>> server = archean.get_servers()[0]
-    >>> print(server.name)
+    Requests time out after `timeout` seconds, and transient failures (timeouts, connection errors, 5xx and 429 responses) are retried with jittered exponential backoff.
+    After `breaker_threshold` failed requests in a row, requests are paused for `breaker_reset` seconds. Meanwhile, and whenever a fetch fails, the last good snapshot is served marked as stale for up to `stale_ttl` seconds.
+    
+    >>> async with Archean() as archean:
+    >>>     server = (await archean.get_servers())[0]
+    >>>     print(server.name)
     """  
   
-    def __init__(self):
+    def __init__(
+        self,
+        connection_limit: int = 10,
+        dns_cache_ttl: int = 300,
+        keepalive_timeout: float = 60,
+        cache_ttl: float = 2,
+        timeout: float = 5,
+        retries: int = 2,
+        retry_delay: float = 0.5,
+        breaker_threshold: int = 3,
+        breaker_reset: float = 30,
+        stale_ttl: float = 300
+    ):
         """
         Initializes Archean class objects.
+
+        Args:
+            connection_limit (int, optional): The maximum amount of simultaneous connections in the pool. Defaults to 10.
+            dns_cache_ttl (int, optional): How long resolved DNS entries are cached for in seconds. Defaults to 300.
+            keepalive_timeout (float, optional): How long idle connections are kept open for in seconds. Defaults to 60.
+            cache_ttl (float, optional): How long a fetched server list is reused for in seconds. Defaults to 2.
+            timeout (float, optional): How long a request may take in seconds. Defaults to 5.
+            retries (int, optional): How many times a transient failure is retried. Defaults to 2.
+            retry_delay (float, optional): The delay before the first retry in seconds, doubled for each retry after. Defaults to 0.5.
+            breaker_threshold (int, optional): How many failed requests in a row pause requests. Defaults to 3.
+            breaker_reset (float, optional): How long requests are paused for in seconds. Defaults to 30.
+            stale_ttl (float, optional): How old the last good snapshot may be to still be served when fetching fails, in seconds. Defaults to 300.
         """        
         
         self.url = "https://api.archean.space/"
         
+        self.connection_limit = connection_limit
+        self.dns_cache_ttl = dns_cache_ttl
+        self.keepalive_timeout = keepalive_timeout
+        
+        self.cache_ttl = cache_ttl
+        
+        self.timeout = timeout
+        self.retries = retries
+        self.retry_delay = retry_delay
+        self.stale_ttl = stale_ttl
+        self.breaker = CircuitBreaker(failure_threshold = breaker_threshold, reset_timeout = breaker_reset)
+        
+        self._session: aiohttp.ClientSession|None = None
+        self._snapshot: ServerSnapshot|None = None
+        self._snapshot_fetch: asyncio.Task|None = None
+        
+    async def __aenter__(self) -> Archean:
+        return self
+    
+    async def __aexit__(self, *args):
+        await self.close()
+        
+    def _get_session(self) -> aiohttp.ClientSession:
+        """
+        Returns the pooled HTTP session, creating it if it doesn't exist yet.
+        The session is created lazily as it must be created within a running event loop.
+
+        Returns:
+            aiohttp.ClientSession: The pooled HTTP session.
+        """
+        
+        if self._session is not None and not self._session.closed:
+            return self._session
+        
+        connector = aiohttp.TCPConnector(
+            limit = self.connection_limit,
+            ttl_dns_cache = self.dns_cache_ttl,
+            keepalive_timeout = self.keepalive_timeout
+        )
+        
+        self._session = aiohttp.ClientSession(
+            connector = connector,
+            timeout = aiohttp.ClientTimeout(total = self.timeout),
+            headers = {
+                "User-Agent": f"{os.getenv("github_repo_url").replace("https://github.com/", "")} ({os.getenv("github_repo_url")})"
+            }
+        )
+        
+        return self._session
+    
+    async def close(self):
+        """
+        Closes the pooled HTTP session. A new session will be created if a request is sent afterwards.
+        """
+        
+        if self._session is None:
+            return
+        
+        await self._session.close()
+        self._session = None
+        
+    async def _send(self, method: str, endpoint: str) -> any:
+        """
+        Sends a HTTP request to the Archean API once.
+
+        Args:
+            method (str): The HTTP method to use.
+            endpoint (str): The endpoint to send the request to.
+
+        Raises:
+            RequestFailure: Raised when a HTTP request to the Archean API fails.
+            InvalidJSON: Raised when the Archean API returns invalid JSON.
+
+        Returns:
+            any: The decoded JSON response from the Archean API.
+        """
+        
+        session = self._get_session()
+        
+        try:
+            async with session.request(method = method, url = self.url + endpoint) as response:
+                if not response.ok:
+                    raise RequestFailure(f"Response failed with status code {response.status}", status = response.status)
+                
+                try:
+                    return await response.json()
+                except (json.decoder.JSONDecodeError, aiohttp.ContentTypeError) as error:
+                    raise InvalidJSON(f"Invalid JSON: {error}")
+        except asyncio.TimeoutError:
+            raise RequestFailure(f"Request timed out after {self.timeout}s")
+        except aiohttp.ClientError as error:
+            raise RequestFailure(f"Request failed: {error}")
+        
     async def _request(self, method: str, endpoint: str) -> any:
         """
-        Sends a HTTP request to the Archean API.
+        Sends a HTTP request to the Archean API, retrying transient failures.
 
         Args:
             method (str): The HTTP method to use.
             endpoint (str): The endpoint to send the request to.
 
         Raises:
+            CircuitOpen: Raised when requests are paused because the Archean API has been failing.
             RequestFailure: Raised when a HTTP request to the Archean API fails.
             InvalidJSON: Raised when the Archean API returns invalid JSON.
 
         Returns:
-            requests.Response: The response from the Archean API.
+            any: The decoded JSON response from the Archean API.
         """        
         
-        async with aiohttp.ClientSession() as session:
-            response = await session.request(method = method, url = self.url + endpoint, headers = {
-                "User-Agent": f"{os.getenv("github_repo_url").replace("https://github.com/", "")} ({os.getenv("github_repo_url")})"
-            })
+        if not self.breaker.allow():
+            raise CircuitOpen("Requests to the Archean API are paused after repeated failures")
+        
+        try:
+            for attempt in range(self.retries + 1):
+                try:
+                    result = await self._send(method, endpoint)
+                except RequestFailure as error:
+                    transient = error.status is None or error.status in TRANSIENT_STATUSES
+                    
+                    if transient and attempt < self.retries:
+                        # full jitter, so retries from many clients don't line up
+                        await asyncio.sleep(random.uniform(0, self.retry_delay * 2 ** attempt))
+                        continue
+                    
+                    raise
+                
+                self.breaker.record_success()
+                return result
+        except BaseException as error:
+            # anything else counts as a failure too, including being cancelled, so a test request can never leave the breaker stuck
+            self._record_failure(error)
+            raise
+        
+    def _record_failure(self, error: Exception):
+        """
+        Records a failed request with the circuit breaker, logging if it opened.
+
+        Args:
+            error (Exception): The error the request failed with.
+        """
+        
+        if self.breaker.record_failure():
+            print.warning("Archean", f"Requests are paused for {self.breaker.reset_timeout:g}s after {self.breaker.failures} failures in a row. Last error: {error}")
+        
+    async def fetch_snapshot(self) -> ServerSnapshot:
+        """
+        Fetches a fresh snapshot of all online Archean servers, bypassing the cache.
+
+        Raises:
+            InvalidSchema: Raised when the Archean API returns an unexpected response schema.
+
+        Returns:
+            ServerSnapshot: The fetched snapshot.
+        """
+        
+        servers = await self._request("GET", "servers")
+        
+        try:
+            servers = [Server._from_dict(server) for server in servers["servers"]]
+        except (KeyError, TypeError, ValueError):
+            raise InvalidSchema("Invalid `/servers` response schema")
+        
+        return ServerSnapshot(
+            servers = servers,
+            fetched_at = time.time()
+        )
+        
+    async def _fetch_and_cache_snapshot(self) -> ServerSnapshot:
+        """
+        Fetches a fresh snapshot and stores it in the cache.
+
+        Returns:
+            ServerSnapshot: The fetched snapshot.
+        """
+        
+        try:
+            self._snapshot = await self.fetch_snapshot()
+            return self._snapshot
+        finally:
+            self._snapshot_fetch = None
+        
+    async def get_snapshot(self, max_age: float = None) -> ServerSnapshot:
+        """
+        Returns a snapshot of all online Archean servers.
+        The cached snapshot is returned if it is younger than `max_age`, otherwise a new one is fetched.
+        Callers that request a snapshot while a fetch is already in progress share that fetch instead of starting their own.
+        If fetching fails, the last good snapshot is returned with `stale` set if it is younger than `stale_ttl`.
+
+        Args:
+            max_age (float, optional): The maximum age of the snapshot in seconds. Defaults to `cache_ttl`.
+
+        Returns:
+            ServerSnapshot: The snapshot.
+        """
+        
+        if max_age is None:
+            max_age = self.cache_ttl
+        
+        if self._snapshot is not None and self._snapshot.age < max_age:
+            return self._snapshot
+        
+        if self._snapshot_fetch is None:
+            self._snapshot_fetch = asyncio.create_task(self._fetch_and_cache_snapshot())
             
-            if not response.ok:
-                raise RequestFailure(f"Response failed with status code {response.status_code}")
+        # shielded so a cancelled caller doesn't cancel the fetch for everyone else
+        try:
+            return await asyncio.shield(self._snapshot_fetch)
+        except (RequestFailure, InvalidJSON, InvalidSchema):
+            if self._snapshot is None or self._snapshot.age >= self.stale_ttl:
+                raise
             
-            try:
-                return await response.json()
-            except json.decoder.JSONDecodeError as error:
-                raise InvalidJSON(f"Invalid JSON: {error}")
+            return replace(self._snapshot, stale = True)
         
     async def get_servers(self) -> list[Server]:
         """
@@ -98,14 +321,31 @@ class Archean():
             list[Server]: A list of all online Archean servers.
         """     
         
-        servers = await self._request("GET", "servers")
+        snapshot = await self.get_snapshot()
+        return snapshot.servers
+    
+    @property
+    def last_snapshot(self) -> ServerSnapshot|None:
+        """
+        Returns the last successfully fetched snapshot, however old it is.
+
+        Returns:
+            ServerSnapshot|None: The snapshot, or None if nothing has been fetched yet.
+        """
         
-        try:
-            servers = servers["servers"]
-        except KeyError:
-            raise InvalidSchema("Invalid `/servers` response schema")
+        return self._snapshot
+    
+    def restore_snapshot(self, snapshot: ServerSnapshot):
+        """
+        Seeds the cache with a previously fetched snapshot, e.g. one saved before a restart.
+        It is reused like any other cached snapshot while younger than `cache_ttl`, and served as stale if fetching fails.
+
+        Args:
+            snapshot (ServerSnapshot): The snapshot.
+        """
         
-        return [Server._from_dict(server) for server in servers]
+        if self._snapshot is None or snapshot.fetched_at > self._snapshot.fetched_at:
+            self._snapshot = snapshot
     
     async def get_server_by_id(self, id: int) -> Server|None:
         """
@@ -118,13 +358,8 @@ class Archean():
             Server|None: The Archean server with the specified ID, or None if not found.
         """     
         
-        servers = await self.get_servers()
-        
-        for server in servers:
-            if server.id != id:
-                continue
-            
-            return server
+        snapshot = await self.get_snapshot()
+        return snapshot.get_server_by_id(id)
         
     async def get_server_by_ip(self, ip: str, port: int) -> Server|None:
         """
@@ -138,13 +373,8 @@ class Archean():
             Server|None: The Archean server with the specified IP and port, or None if not found.
         """
         
-        servers = await self.get_servers()
-        
-        for server in servers:
-            if server.ip != ip or server.port != port:
-                continue
-            
-            return server
+        snapshot = await self.get_snapshot()
+        return snapshot.get_server_by_ip(ip, port)
         
     async def get_servers_by_gamemode(self, gamemode: Gamemode) -> list[Server]:
         """
@@ -157,8 +387,8 @@ class Archean():
             list[Server]: A list of servers with the specified gamemode.
         """        
         
-        servers = await self.get_servers()
-        return [server for server in servers if server.gamemode == gamemode]
+        snapshot = await self.get_snapshot()
+        return snapshot.get_servers_by_gamemode(gamemode)
     
     async def get_servers_by_password(self, password_protected: PasswordProtected) -> list[Server]:
         """
@@ -171,8 +401,142 @@ class Archean():
             list[Server]: A list of servers with the specified password protection status.
         """        
         
-        servers = await self.get_servers()
-        return [server for server in servers if server.password_protected == password_protected]
+        snapshot = await self.get_snapshot()
+        return snapshot.get_servers_by_password(password_protected)
+        
+@dataclass
+class ServerSnapshot():
+    """
+    A list of all online Archean servers at a given time.
+    Indexes are built once on creation so lookups don't need to scan every server.
+    """
+    
+    servers: list[Server]
+    fetched_at: float
+    stale: bool = False # True if fetching failed and this is the last good snapshot
+    
+    _by_id: dict[int, Server] = field(init = False, repr = False, compare = False)
+    _by_address: dict[tuple[str, int], Server] = field(init = False, repr = False, compare = False)
+    _by_gamemode: dict[Gamemode, list[Server]] = field(init = False, repr = False, compare = False)
+    _by_password: dict[PasswordProtected, list[Server]] = field(init = False, repr = False, compare = False)
+    
+    def __post_init__(self):
+        """
+        Builds the lookup indexes for this snapshot.
+        """
+        
+        self._by_id = {}
+        self._by_address = {}
+        self._by_gamemode = {}
+        self._by_password = {}
+        
+        for server in self.servers:
+            # first occurrence wins, matching the previous linear scans
+            self._by_id.setdefault(server.id, server)
+            self._by_address.setdefault((server.ip, server.port), server)
+            
+            self._by_gamemode.setdefault(server.gamemode, []).append(server)
+            self._by_password.setdefault(server.password_protected, []).append(server)
+    
+    @property
+    def age(self) -> float:
+        """
+        Returns how long ago this snapshot was fetched.
+
+        Returns:
+            float: The age of this snapshot in seconds.
+        """
+        
+        return time.time() - self.fetched_at
+    
+    def to_dict(self) -> dict:
+        """
+        Returns this snapshot as a JSON-serializable dictionary.
+
+        Returns:
+            dict: The snapshot, with servers in the same format as the Archean API.
+        """
+        
+        return {
+            "fetched_at" : self.fetched_at,
+            "servers" : [server._to_dict() for server in self.servers]
+        }
+    
+    @classmethod
+    def from_dict(cls, data: dict) -> ServerSnapshot:
+        """
+        Creates a snapshot from a dictionary created with `to_dict`.
+
+        Args:
+            data (dict): The dictionary.
+
+        Raises:
+            InvalidSchema: Raised when the dictionary isn't a valid snapshot.
+
+        Returns:
+            ServerSnapshot: The snapshot.
+        """
+        
+        try:
+            return cls(
+                servers = [Server._from_dict(server) for server in data["servers"]],
+                fetched_at = float(data["fetched_at"])
+            )
+        except (KeyError, TypeError, ValueError) as error:
+            raise InvalidSchema(f"Invalid snapshot: {error}")
+    
+    def get_server_by_id(self, id: int) -> Server|None:
+        """
+        Returns the server with the specified ID.
+
+        Args:
+            id (int): The ID of the server.
+
+        Returns:
+            Server|None: The server with the specified ID, or None if not found.
+        """
+        
+        return self._by_id.get(id)
+    
+    def get_server_by_ip(self, ip: str, port: int) -> Server|None:
+        """
+        Returns the server with the specified IP and port.
+
+        Args:
+            ip (str): The IP of the server.
+            port (int): The port of the server.
+
+        Returns:
+            Server|None: The server with the specified IP and port, or None if not found.
+        """
+        
+        return self._by_address.get((ip, port))
+    
+    def get_servers_by_gamemode(self, gamemode: Gamemode) -> list[Server]:
+        """
+        Returns a list of servers with a specific gamemode.
+
+        Args:
+            gamemode (Gamemode): The gamemode to filter by.
+
+        Returns:
+            list[Server]: A list of servers with the specified gamemode.
+        """
+        
+        return list(self._by_gamemode.get(gamemode, []))
+    
+    def get_servers_by_password(self, password_protected: PasswordProtected) -> list[Server]:
+        """
+        Returns a list of servers with a specific password protection status.
+
+        Args:
+            password_protected (PasswordProtected): The password protection status to filter by.
+
+        Returns:
+            list[Server]: A list of servers with the specified password protection status.
+        """
+        
+        return list(self._by_password.get(password_protected, []))
         
 @dataclass
 class Server():
@@ -210,4 +574,25 @@ class Server():
             gamemode = Gamemode(data["mode"]),
             password_protected = PasswordProtected(data["pswd"]),
             version = data["version"]
-        )
\ No newline at end of file
+        )
+    
+    def _to_dict(self) -> dict:
+        """
+        Returns this server as a dictionary, in the same format as the Archean API.
+
+        Returns:
+            dict: The dictionary, which can be passed to `_from_dict`.
+        """
+        
+        return {
+            "id" : self.id,
+            "name" : self.name,
+            "host" : self.ip,
+            "port" : self.port,
+            "branch" : self.branch,
+            "nb_players" : self.players,
+            "max_players" : self.max_players,
+            "mode" : self.gamemode.value,
+            "pswd" : self.password_protected.value,
+            "version" : self.version
+        }
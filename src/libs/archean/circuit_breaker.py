@@ -0,0 +1,121 @@
+# // ---------------------------------------------------------------------
+# // ------- [Libs] Archean - Circuit Breaker
+# // ---------------------------------------------------------------------
+
+"""
+A module for pausing requests to a failing API.
+Repo: https://github.com/cuhHub/ArcheanBot
+
+---
+
+Copyright (C) 2024 Cuh4
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+# ---- // Imports
+import time
+
+# ---- // Main
+class CircuitBreaker():
+    """
+    A class for pausing requests to an API after it fails too many times in a row.
+
+    The breaker starts closed, letting every request through. After `failure_threshold` failures in a row it opens, and requests are refused for `reset_timeout` seconds.
+    Once that has passed, a single request is let through to test the API. If it succeeds the breaker closes, otherwise it opens again.
+
+    >>> breaker = CircuitBreaker(failure_threshold = 3, reset_timeout = 30)
+    >>> if breaker.allow():
+    >>>     ...
+    >>>     breaker.record_success()
+    """
+
+    def __init__(self, failure_threshold: int = 3, reset_timeout: float = 30):
+        """
+        Initializes `CircuitBreaker` class objects.
+
+        Args:
+            failure_threshold (int, optional): How many failures in a row open the breaker. Defaults to 3.
+            reset_timeout (float, optional): How long the breaker stays open for in seconds. Defaults to 30.
+        """
+
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+
+        self.failures = 0
+        self.opened_at: float|None = None
+        self.trial = False # whether a test request is in progress
+
+        self.times_opened = 0
+
+    @property
+    def is_open(self) -> bool:
+        """
+        Returns whether or not requests are currently being refused.
+
+        Returns:
+            bool: True if open.
+        """
+
+        return self.opened_at is not None
+
+    def allow(self) -> bool:
+        """
+        Returns whether or not a request may be sent now.
+        Once the breaker has been open for `reset_timeout` seconds, this returns True once to let a test request through.
+
+        Returns:
+            bool: True if the request may be sent.
+        """
+
+        if self.opened_at is None:
+            return True
+
+        if self.trial or time.monotonic() - self.opened_at < self.reset_timeout:
+            return False
+
+        self.trial = True
+        return True
+
+    def record_success(self):
+        """
+        Records a successful request, closing the breaker.
+        """
+
+        self.failures = 0
+        self.opened_at = None
+        self.trial = False
+
+    def record_failure(self) -> bool:
+        """
+        Records a failed request, opening the breaker if there have been too many in a row or a test request failed.
+
+        Returns:
+            bool: True if the breaker was closed and has just opened. False if it was already open, e.g. a test request failed.
+        """
+
+        self.failures += 1
+
+        if self.trial:
+            self.opened_at = time.monotonic()
+            self.trial = False
+
+            return False
+
+        if self.opened_at is None and self.failures >= self.failure_threshold:
+            self.opened_at = time.monotonic()
+            self.times_opened += 1
+
+            return True
+
+        return False
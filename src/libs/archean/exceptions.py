@@ -29,6 +29,23 @@ class RequestFailure(Exception):
     Raised when a HTTP request to the Archean API fails.
     """
 
+    def __init__(self, message: str, status: int|None = None):
+        """
+        Initializes `RequestFailure` class objects.
+
+        Args:
+            message (str): The error message.
+            status (int|None, optional): The HTTP status code of the response, if one was received. Defaults to None.
+        """
+
+        super().__init__(message)
+        self.status = status
+
+class CircuitOpen(RequestFailure):
+    """
+    Raised when a request isn't sent because the Archean API has been failing and requests are paused.
+    """
+
     pass
 
 class InvalidJSON(Exception):
@@ -0,0 +1,147 @@
+# // ---------------------------------------------------------------------
+# // ------- [Libs] Chart
+# // ---------------------------------------------------------------------
+
+"""
+A small module for rendering player count charts as PNG images, without any third-party dependencies.
+Repo: https://github.com/cuhHub/ArcheanBot
+
+---
+
+Copyright (C) 2024 Cuh4
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+# ---- // Imports
+import struct
+import zlib
+from dataclasses import dataclass
+
+# ---- // Variables
+BACKGROUND = (43, 45, 49)
+GRID = (64, 66, 73)
+BAND = (62, 92, 66)
+LINE = (125, 200, 125)
+
+# ---- // Main
+@dataclass
+class ChartWindow():
+    """
+    The player counts within a window of time, drawn as one step of a chart.
+    """
+
+    start: float
+    end: float
+    low: float
+    average: float
+    high: float
+
+def encode_png(width: int, height: int, pixels: bytes) -> bytes:
+    """
+    Encodes RGB pixels as a PNG image.
+
+    Args:
+        width (int): The width of the image.
+        height (int): The height of the image.
+        pixels (bytes): The pixels, 3 bytes per pixel, row by row from the top left.
+
+    Returns:
+        bytes: The PNG image.
+    """
+
+    def chunk(kind: bytes, data: bytes) -> bytes:
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+    stride = width * 3
+    rows = b"".join(b"\x00" + pixels[y * stride:(y + 1) * stride] for y in range(height)) # each row is prefixed with filter type 0 (none)
+
+    return b"".join([
+        b"\x89PNG\r\n\x1a\n",
+        chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)),
+        chunk(b"IDAT", zlib.compress(rows, 6)),
+        chunk(b"IEND", b"")
+    ])
+
+def render_player_chart(windows: list[ChartWindow], start: float, end: float, maximum: float, width: int = 800, height: int = 300) -> bytes:
+    """
+    Renders a player count chart as a PNG image.
+    Each window is drawn as a shaded band from its lowest to its highest player count, with a line through its average. Gaps between windows are left empty.
+
+    Args:
+        windows (list[ChartWindow]): The windows to draw.
+        start (float): The time at the left edge of the chart.
+        end (float): The time at the right edge of the chart.
+        maximum (float): The player count at the top edge of the chart. Grid lines are drawn at every quarter of it.
+        width (int, optional): The width of the image. Defaults to 800.
+        height (int, optional): The height of the image. Defaults to 300.
+
+    Returns:
+        bytes: The PNG image.
+    """
+
+    pixels = bytearray(bytes(BACKGROUND) * (width * height))
+    maximum = max(maximum, 1)
+    padding = 8
+    plot_height = height - padding * 2
+
+    def set_pixel(x: int, y: int, color: tuple[int, int, int]):
+        index = (y * width + x) * 3
+        pixels[index:index + 3] = bytes(color)
+
+    def to_y(player_count: float) -> int:
+        player_count = min(max(player_count, 0), maximum)
+        return padding + round((1 - player_count / maximum) * (plot_height - 1))
+
+    # Grid
+    for quarter in range(5):
+        y = to_y(maximum * quarter / 4)
+        pixels[y * width * 3:(y + 1) * width * 3] = bytes(GRID) * width
+
+    # Work out what each column shows
+    columns: list[ChartWindow|None] = [None] * width
+    duration = max(end - start, 1)
+
+    for window in windows:
+        first = max(int((window.start - start) / duration * width), 0)
+        last = min(int((window.end - start) / duration * width), width)
+
+        for x in range(first, max(last, first + 1)):
+            if x < width:
+                columns[x] = window
+
+    # Bands
+    for x, window in enumerate(columns):
+        if window is None:
+            continue
+
+        for y in range(to_y(window.high), to_y(window.low) + 1):
+            set_pixel(x, y, BAND)
+
+    # Average line, joined vertically between columns
+    previous_y = None
+
+    for x, window in enumerate(columns):
+        if window is None:
+            previous_y = None
+            continue
+
+        y = to_y(window.average)
+        top, bottom = (y, y) if previous_y is None else (min(y, previous_y), max(y, previous_y))
+
+        for line_y in range(max(top - 1, 0), min(bottom + 2, height)):
+            set_pixel(x, line_y, LINE)
+
+        previous_y = y
+
+    return encode_png(width, height, bytes(pixels))
@@ -0,0 +1,112 @@
+# // ---------------------------------------------------------------------
+# // ------- [Libs] Event Bus
+# // ---------------------------------------------------------------------
+
+"""
+A module for publishing typed events to async subscribers.
+Repo: https://github.com/cuhHub/ArcheanBot
+
+---
+
+Copyright (C) 2024 Cuh4
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+# ---- // Imports
+import asyncio
+from typing import Awaitable, Callable
+
+from libs import print
+
+# ---- // Main
+class EventBus():
+    """
+    A class for publishing typed events to async subscribers.
+
+    Each subscriber has its own queue, handled in the background one event at a time. Publishing returns straight away, so a slow subscriber never holds up the publisher or the other subscribers, while every subscriber still sees events in the order they were published.
+
+    >>> bus = EventBus()
+    >>> bus.subscribe(SomeEvent, callback)
+    >>> bus.publish(SomeEvent(...))
+    """
+
+    def __init__(self):
+        """
+        Initializes `EventBus` class objects.
+        """
+
+        self.subscribers: dict[type, list[Callable[[any], Awaitable[None]]]] = {}
+
+        self._queues: dict[Callable[[any], Awaitable[None]], asyncio.Queue] = {}
+        self._workers: dict[Callable[[any], Awaitable[None]], asyncio.Task] = {}
+
+    def subscribe(self, event_type: type, callback: Callable[[any], Awaitable[None]]):
+        """
+        Subscribes a callback to an event type.
+        A callback subscribed to multiple event types shares one queue, so it sees all of them in order.
+
+        Args:
+            event_type (type): The type of event to subscribe to.
+            callback (Callable[[any], Awaitable[None]]): The async callback to call with the event.
+        """
+
+        self.subscribers.setdefault(event_type, []).append(callback)
+
+    def publish(self, event: any):
+        """
+        Queues an event for all of its subscribers. Returns straight away.
+        A failing subscriber doesn't affect the others.
+
+        Args:
+            event (any): The event to publish.
+        """
+
+        for callback in self.subscribers.get(type(event), []):
+            queue = self._queues.get(callback)
+
+            if queue is None:
+                queue = self._queues[callback] = asyncio.Queue()
+                self._workers[callback] = asyncio.create_task(self._deliver(callback, queue))
+
+            queue.put_nowait(event)
+
+    async def _deliver(self, callback: Callable[[any], Awaitable[None]], queue: asyncio.Queue):
+        """
+        Hands a subscriber its queued events one at a time, forever.
+
+        Args:
+            callback (Callable[[any], Awaitable[None]]): The subscriber.
+            queue (asyncio.Queue): The subscriber's queue.
+        """
+
+        while True:
+            event = await queue.get()
+
+            try:
+                await callback(event)
+            except Exception as error:
+                print.error("Event Bus", f"Subscriber `{callback.__qualname__}` failed to handle `{type(event).__name__}`: {error}")
+            finally:
+                queue.task_done()
+
+    def close(self):
+        """
+        Stops handling events. Anything still queued is dropped.
+        """
+
+        for worker in self._workers.values():
+            worker.cancel()
+
+        self._workers.clear()
+        self._queues.clear()
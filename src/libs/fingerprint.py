@@ -0,0 +1,141 @@
+# // ---------------------------------------------------------------------
+# // ------- [Libs] Fingerprint
+# // ---------------------------------------------------------------------
+
+"""
+A module for skipping message edits that wouldn't change anything.
+Repo: https://github.com/cuhHub/ArcheanBot
+
+---
+
+Copyright (C) 2024 Cuh4
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+# ---- // Imports
+import discord
+import hashlib
+import json
+import re
+import time
+
+# ---- // Variables
+RELATIVE_TIMESTAMP_PATTERN = re.compile(r"<t:-?\d+:R>")
+
+# ---- // Main
+class RenderFingerprint():
+    """
+    A class for tracking the last embed sent to a message, so identical edits can be skipped.
+
+    >>> fingerprint = RenderFingerprint(max_age = 300)
+    >>> if fingerprint.should_edit(embed):
+    >>>     await message.edit(embed = embed)
+    >>>     fingerprint.record(embed)
+    """
+
+    def __init__(self, max_age: float):
+        """
+        Initializes `RenderFingerprint` class objects.
+
+        Args:
+            max_age (float): How long in seconds an embed containing relative timestamps can go without being re-sent.
+        """
+
+        self.max_age = max_age
+
+        self.last_fingerprint: str|None = None
+        self.last_edit_at = 0
+        self.last_has_relative_timestamp = False
+
+        self.performed = 0
+        self.skipped = 0
+
+    @staticmethod
+    def fingerprint(embed: discord.Embed) -> str:
+        """
+        Returns a hash of an embed's serialized content.
+
+        Args:
+            embed (discord.Embed): The embed to hash.
+
+        Returns:
+            str: The hash.
+        """
+
+        serialized = json.dumps(embed.to_dict(), sort_keys = True, default = str)
+        return hashlib.blake2b(serialized.encode(), digest_size = 16).hexdigest()
+
+    @staticmethod
+    def has_relative_timestamp(embed: discord.Embed) -> bool:
+        """
+        Returns whether or not an embed contains a relative Discord timestamp.
+
+        Args:
+            embed (discord.Embed): The embed to check.
+
+        Returns:
+            bool: True if the embed contains a relative timestamp.
+        """
+
+        return RELATIVE_TIMESTAMP_PATTERN.search(json.dumps(embed.to_dict(), default = str)) is not None
+
+    @property
+    def stale(self) -> bool:
+        """
+        Returns whether or not the last sent embed contains relative timestamps and is due a refresh.
+
+        Returns:
+            bool: True if stale.
+        """
+
+        return self.last_has_relative_timestamp and time.time() - self.last_edit_at >= self.max_age
+
+    def should_edit(self, embed: discord.Embed) -> bool:
+        """
+        Returns whether or not an edit with the provided embed would change anything.
+        Counts the edit as skipped if not.
+
+        Args:
+            embed (discord.Embed): The embed that would be sent.
+
+        Returns:
+            bool: True if the message should be edited.
+        """
+
+        if self.fingerprint(embed) != self.last_fingerprint or self.stale:
+            return True
+
+        self.skipped += 1
+        return False
+
+    def record(self, embed: discord.Embed):
+        """
+        Records a successful edit with the provided embed.
+
+        Args:
+            embed (discord.Embed): The embed that was sent.
+        """
+
+        self.last_fingerprint = self.fingerprint(embed)
+        self.last_edit_at = time.time()
+        self.last_has_relative_timestamp = self.has_relative_timestamp(embed)
+
+        self.performed += 1
+
+    def reset(self):
+        """
+        Forgets the last sent embed, forcing the next edit through.
+        """
+
+        self.last_fingerprint = None
@@ -24,51 +24,215 @@ limitations under the License.
 """
 
 # ---- // Imports
+import copy
 import json
 import os
+import threading
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from typing import Iterator
 
 # ---- // Main
+class SchemaType(ABC):
+    """
+    A compiled type check for a value in a JSON database schema.
+    """
+    
+    @abstractmethod
+    def check(self, value: any) -> bool:
+        """
+        Returns whether a value matches this type. Used when a value is set.
+
+        Args:
+            value (any): The value.
+
+        Returns:
+            bool: Whether the value matches.
+        """
+        
+        pass
+    
+    def decode(self, value: any) -> any:
+        """
+        Converts a value loaded from JSON into this type. Used when the database is loaded.
+
+        Args:
+            value (any): The loaded value.
+
+        Raises:
+            SchemaError: If the value can't be converted.
+
+        Returns:
+            any: The converted value.
+        """
+        
+        if not self.check(value):
+            raise SchemaError(f"Invalid value for {self}: {value!r}")
+        
+        return value
+    
+class _Exact(SchemaType):
+    """
+    A type check for plain values (int, str, etc), matching the type exactly.
+    """
+    
+    def __init__(self, value_type: type):
+        self.type = value_type
+        
+    def __repr__(self) -> str:
+        return self.type.__name__
+        
+    def check(self, value: any) -> bool:
+        return type(value) is self.type
+    
+class DictOf(SchemaType):
+    """
+    A typed dictionary schema type, e.g. `DictOf(int, int)` for guild IDs to message IDs.
+    JSON only has string keys, so `int` keys are converted when the database is loaded.
+    """
+    
+    def __init__(self, key_type: type, value_type: "type|SchemaType"):
+        """
+        A typed dictionary schema type.
+
+        Args:
+            key_type (type): The type of the keys. Must be `str` or `int`.
+            value_type (type|SchemaType): The type of the values.
+        """
+        
+        if key_type not in (str, int):
+            raise SchemaError(f"Invalid key type for DictOf: {key_type} (must be str or int)")
+        
+        self.key_type = key_type
+        self.value_type = compile_type(value_type)
+        
+    def __repr__(self) -> str:
+        return f"DictOf({self.key_type.__name__}, {self.value_type})"
+        
+    def check(self, value: any) -> bool:
+        return type(value) is dict and all(type(key) is self.key_type and self.value_type.check(item) for key, item in value.items())
+    
+    def decode(self, value: any) -> dict:
+        if type(value) is not dict:
+            raise SchemaError(f"Invalid value for {self}: {value!r}")
+        
+        try:
+            return {self.key_type(key) : self.value_type.decode(item) for key, item in value.items()}
+        except ValueError:
+            raise SchemaError(f"Invalid key for {self}: {value!r}")
+    
+class ListOf(SchemaType):
+    """
+    A typed list schema type, e.g. `ListOf(int)`.
+    """
+    
+    def __init__(self, item_type: "type|SchemaType"):
+        """
+        A typed list schema type.
+
+        Args:
+            item_type (type|SchemaType): The type of the items.
+        """
+        
+        self.item_type = compile_type(item_type)
+        
+    def __repr__(self) -> str:
+        return f"ListOf({self.item_type})"
+        
+    def check(self, value: any) -> bool:
+        return type(value) is list and all(self.item_type.check(item) for item in value)
+    
+    def decode(self, value: any) -> list:
+        if type(value) is not list:
+            raise SchemaError(f"Invalid value for {self}: {value!r}")
+        
+        return [self.item_type.decode(item) for item in value]
+    
+def compile_type(value_type: "type|SchemaType") -> SchemaType:
+    """
+    Compiles a schema value type into a type check.
+
+    Args:
+        value_type (type|SchemaType): A plain type (int, str, etc) or a schema type (DictOf, ListOf).
+
+    Returns:
+        SchemaType: The type check.
+    """
+    
+    return value_type if isinstance(value_type, SchemaType) else _Exact(value_type)
+    
 class SchemaValue():
     """
     Represents a value in a JSON database schema.
     """
     
-    def __init__(self, *, value_type: any, default: any):
+    def __init__(self, *, value_type: "type|SchemaType", default: any):
         """
         Represents a value in a JSON database schema.
 
         Args:
-            value_type (any): The type of the value.
+            value_type (type|SchemaType): The type of the value. Either a plain type (int, str, etc) or a schema type (DictOf, ListOf).
             default (any): The default value to use if the value doesn't exist in the database.
 
         Raises:
             SchemaError: If the value type doesn't match the default provided.
         """
         
-        if type(default) != value_type:
-            raise SchemaError(f"Invalid default type for schema value: {type(default)} != {value_type}")
-        
         self.type = value_type
+        self.checker = compile_type(value_type)
+        
+        if not self.checker.check(default):
+            raise SchemaError(f"Invalid default type for schema value: {default!r} is not {self.checker}")
+        
         self.default = default
         
+    def get_default(self) -> any:
+        """
+        Returns a copy of the default value, so collections aren't shared.
+
+        Returns:
+            any: The default value.
+        """
+        
+        return copy.deepcopy(self.default)
 
 class Database():
     """
     A class for storing values into a JSON database.
+    
+    Writes replace the file in one step (via a temporary file), so a crash mid-write can't truncate it.
+    With a write delay, `set` calls only update memory, and everything set within the delay is written at once on a background thread.
+    
+    >>> database = Database("bot.json", schema, write_delay = 1)
+    >>> with database.transaction():
+    >>>     database.set("a", 1)
+    >>>     database.set("b", 2)
+    >>> database.close() # writes anything not yet written
     """
     
-    def __init__(self, path: str, schema: dict[str, SchemaValue] = None):
+    def __init__(self, path: str, schema: dict[str, SchemaValue] = None, write_delay: float = 0):
         """
         A class for storing values into a JSON database.
 
         Args:
             path (str): The path to the JSON database.
+            schema (dict[str, SchemaValue], optional): The schema of the database.
+            write_delay (float, optional): How long to wait after a value is set before writing to disk, in seconds. 0 writes straight away. Defaults to 0.
         """        
         
         self.path = path
         self.schema: dict[str, SchemaValue] = schema
+        self.write_delay = write_delay
         self.data = {}
         
+        self.writes = 0
+        
+        self._dirty = False
+        self._transaction_depth = 0
+        self._timer: threading.Timer|None = None
+        self._lock = threading.RLock()
+        self._write_lock = threading.Lock()
+        
         try:
             self._load()
         except:
@@ -103,37 +267,166 @@ class Database():
         
     def _save(self):
         """
-        Saves the database.
+        Saves the database, replacing the file in one step.
         """
         
+        with self._write_lock:
+            with self._lock:
+                self._dirty = False
+                contents = json.dumps(self.data, indent = 7)
+                
+            try:
+                self._create_path()
+                temporary_path = self.path + ".tmp"
+                
+                with open(temporary_path, "w") as file:
+                    file.write(contents)
+                    file.flush()
+                    os.fsync(file.fileno())
+                    
+                os.replace(temporary_path, self.path)
+            except Exception as error:
+                with self._lock:
+                    self._dirty = True
+                    
+                raise DatabaseError(f"Failed to save database: {error}")
+            
+            self.writes += 1
+            
+    def _schedule_save(self):
+        """
+        Saves the database straight away, or after the write delay if there is one.
+        Saves are skipped within a transaction, and the transaction saves once it ends instead.
+        """
+        
+        with self._lock:
+            self._dirty = True
+            
+            if self._transaction_depth > 0:
+                return
+            
+            if self.write_delay <= 0:
+                save_now = True
+            else:
+                save_now = False
+                
+                # the delay counts from the first unsaved change, so constant changes can't put off writing forever
+                if self._timer is None:
+                    self._timer = threading.Timer(self.write_delay, self._save_later)
+                    self._timer.daemon = True
+                    self._timer.start()
+                    
+        if save_now:
+            self._save()
+            
+    def _save_later(self):
+        """
+        Called by the write delay timer. Skipped while a transaction is open (possibly on another thread) so a half-applied transaction is never written. The transaction schedules a save once it ends instead.
+        """
+        
+        with self._lock:
+            self._timer = None
+            
+            if self._transaction_depth > 0:
+                return
+            
         try:
-            self._create_path()
+            self.flush()
+        except DatabaseError:
+            pass # left dirty, so retried by the next save or `close()`
+        
+    def flush(self):
+        """
+        Writes any changes that haven't been written yet.
+        """
+        
+        if self._dirty:
+            self._save()
             
-            with open(self.path, "w") as file:
-                json.dump(self.data, file, indent = 7)
-        except Exception as error:
-            raise DatabaseError(f"Failed to save database: {error}")
+    def close(self):
+        """
+        Cancels the pending delayed write and writes any changes that haven't been written yet. Called on shutdown.
+        """
+        
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+                
+        self.flush()
+        
+    @contextmanager
+    def transaction(self) -> Iterator["Database"]:
+        """
+        Batches every `set` within the block into one write. If the block raises an exception, the values set within it are reverted.
+        
+        Yields:
+            Database: This database.
+        """
+        
+        with self._lock:
+            self._transaction_depth += 1
+            snapshot = (copy.deepcopy(self.data), self._dirty) if self._transaction_depth == 1 else None
+            
+        try:
+            yield self
+        except:
+            if snapshot is not None:
+                with self._lock:
+                    self.data, self._dirty = snapshot
+                    
+            raise
+        finally:
+            with self._lock:
+                self._transaction_depth -= 1
+                changed = self._transaction_depth == 0 and self._dirty
+                
+            if changed:
+                self._schedule_save()
         
     def _validate(self):
         """
         Iterates through the schema and validates each value in the database by matching with the schema.
+        Values that don't match are replaced with their default. Only done on load, since `set` validates values as they come in.
         """
         
         validated = {}
         
         for index, schema_value in self.schema.items():
-            saved_value = self.data.get(index)
-            
-            if type(saved_value) == schema_value.type:
-                validated[index] = saved_value
-                continue
-            
-            validated[index] = schema_value.default
+            try:
+                validated[index] = schema_value.checker.decode(self.data[index])
+            except (KeyError, SchemaError):
+                validated[index] = schema_value.get_default()
             
         self.data = validated
             
     def get_schema_value(self, index: str) -> SchemaValue:
         return self.schema.get(index)
+    
+    def _check(self, index: str, value: any) -> SchemaValue:
+        """
+        Raises an error if a value can't be set at an index.
+
+        Args:
+            index (str): The index.
+            value (any): The value.
+
+        Raises:
+            DatabaseError: If the index isn't in the schema, or the value doesn't match its type.
+
+        Returns:
+            SchemaValue: The schema value of the index.
+        """
+        
+        schema_value = self.get_schema_value(index)
+        
+        if schema_value is None:
+            raise DatabaseError(f"Invalid index (not in schema): {index}")
+        
+        if not schema_value.checker.check(value):
+            raise DatabaseError(f"Invalid value for {index}: {value!r} is not {schema_value.checker}")
+        
+        return schema_value
         
     def set(self, index: str, value: any):
         """
@@ -144,20 +437,60 @@ class Database():
             value (any): The value to set.
         """
         
+        self._check(index, value)
+        
+        with self._lock:
+            self.data[index] = value
+            
+        self._schedule_save()
+        
+    def set_item(self, index: str, key: any, value: any):
+        """
+        Sets a single item of a `DictOf` value, only validating the item rather than the whole dictionary.
+
+        Args:
+            index (str): The index of the dictionary.
+            key (any): The key of the item.
+            value (any): The value of the item.
+        """
+        
         schema_value = self.get_schema_value(index)
         
-        if schema_value is None:
-            raise DatabaseError(f"Invalid index (not in schema): {index}")
+        if schema_value is None or not isinstance(schema_value.checker, DictOf):
+            raise DatabaseError(f"Invalid index (not a DictOf in schema): {index}")
+        
+        if type(key) is not schema_value.checker.key_type or not schema_value.checker.value_type.check(value):
+            raise DatabaseError(f"Invalid item for {index}: {key!r}: {value!r} doesn't match {schema_value.checker}")
         
-        if type(value) != schema_value.type:
-            raise DatabaseError(f"Invalid value type: {type(value)} != {schema_value.type}")
+        with self._lock:
+            self.data[index][key] = value
+            
+        self._schedule_save()
+        
+    def delete_item(self, index: str, key: any):
+        """
+        Removes a single item of a `DictOf` value, if it exists.
+
+        Args:
+            index (str): The index of the dictionary.
+            key (any): The key of the item.
+        """
+        
+        schema_value = self.get_schema_value(index)
         
-        self.data[index] = value
-        self._save()
+        if schema_value is None or not isinstance(schema_value.checker, DictOf):
+            raise DatabaseError(f"Invalid index (not a DictOf in schema): {index}")
+        
+        with self._lock:
+            if self.data[index].pop(key, None) is None:
+                return
+            
+        self._schedule_save()
         
     def get(self, index: str) -> any:
         """
         Returns a value from the database.
+        Values are validated when loaded and set, so this is a plain lookup. Collections are returned as-is, so use `set`/`set_item` rather than modifying them.
         
         Args:
             index (str): The index of the value to get.
@@ -166,19 +499,11 @@ class Database():
             any: The value from the database.
         """
         
-        schema_value = self.get_schema_value(index)
-        
-        if schema_value is None:
+        try:
+            return self.data[index]
+        except KeyError:
             raise DatabaseError(f"Invalid index (not in schema): {index}")
         
-        value = self.data.get(index)
-        
-        if type(value) != schema_value.type:
-            self._validate()
-            value = schema_value.default
-        
-        return value
-        
 class DatabaseError(Exception):
     pass
 
@@ -0,0 +1,154 @@
+# // ---------------------------------------------------------------------
+# // ------- [Libs] Lifecycle
+# // ---------------------------------------------------------------------
+
+"""
+A module for pausing and resuming background work while the bot is disconnected from Discord.
+Repo: https://github.com/cuhHub/ArcheanBot
+
+---
+
+Copyright (C) 2024 Cuh4
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+# ---- // Imports
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable
+
+from libs import print
+
+# ---- // Main
+class Lifecycle():
+    """
+    A class for tracking whether the bot is connected to Discord, and pausing and resuming background work to match.
+    Also owns a small shared thread pool for blocking startup work.
+
+    Work is paused as soon as any shard disconnects, and resumed once every shard has reconnected.
+
+    >>> lifecycle = Lifecycle(max_workers = 2)
+    >>> lifecycle.add_hooks(pause = loop.stop, resume = loop.start)
+    >>> lifecycle.disconnected(shard_id = 0) # calls loop.stop()
+    >>> lifecycle.connected(shard_id = 0) # calls loop.start()
+    """
+
+    def __init__(self, max_workers: int = 2):
+        """
+        Initializes `Lifecycle` class objects.
+
+        Args:
+            max_workers (int, optional): The amount of threads used for blocking startup work. Defaults to 2.
+        """
+
+        self.executor = ThreadPoolExecutor(max_workers = max_workers, thread_name_prefix = "lifecycle")
+
+        self.paused = False
+        self.pauses = 0
+        self.disconnected_shards: set[int] = set()
+
+        self._hooks: list[tuple[Callable[[], None], Callable[[], None]]] = []
+
+    def add_hooks(self, pause: Callable[[], None], resume: Callable[[], None]):
+        """
+        Registers functions to call when work is paused and resumed.
+        If work is currently paused, `pause` is called straight away.
+
+        Args:
+            pause (Callable[[], None]): Called when the bot disconnects.
+            resume (Callable[[], None]): Called when the bot reconnects.
+        """
+
+        self._hooks.append((pause, resume))
+
+        if self.paused:
+            self._call(pause)
+
+    def _call(self, hook: Callable[[], None]):
+        """
+        Calls a hook, logging any errors so one failing hook doesn't stop the rest.
+
+        Args:
+            hook (Callable[[], None]): The hook.
+        """
+
+        try:
+            hook()
+        except Exception as error:
+            print.error("Lifecycle", f"Hook {getattr(hook, "__qualname__", hook)} failed: {error}")
+
+    def disconnected(self, shard_id: int):
+        """
+        Records that a shard disconnected, pausing work if it was the first.
+
+        Args:
+            shard_id (int): The ID of the shard.
+        """
+
+        self.disconnected_shards.add(shard_id)
+
+        if self.paused:
+            return
+
+        self.paused = True
+        self.pauses += 1
+
+        for pause, _ in self._hooks:
+            self._call(pause)
+
+    def connected(self, shard_id: int):
+        """
+        Records that a shard connected (or resumed), resuming work if it was the last one disconnected.
+
+        Args:
+            shard_id (int): The ID of the shard.
+        """
+
+        self.disconnected_shards.discard(shard_id)
+
+        if not self.paused or len(self.disconnected_shards) > 0:
+            return
+
+        self.paused = False
+
+        for _, resume in self._hooks:
+            self._call(resume)
+
+    def run_blocking(self, function: Callable, name: str) -> asyncio.Future:
+        """
+        Runs a blocking function on the shared thread pool, logging any errors.
+
+        Args:
+            function (Callable): The function.
+            name (str): A name for the work, used in logs.
+
+        Returns:
+            asyncio.Future: Resolved with the function's result.
+        """
+
+        future = asyncio.get_running_loop().run_in_executor(self.executor, function)
+
+        def log_error(future: asyncio.Future):
+            if not future.cancelled() and future.exception() is not None:
+                print.error("Lifecycle", f"{name} failed: {future.exception()}")
+
+        future.add_done_callback(log_error)
+        return future
+
+    def close(self):
+        """
+        Shuts down the thread pool without waiting for unfinished work.
+        """
+
+        self.executor.shutdown(wait = False, cancel_futures = True)
@@ -0,0 +1,118 @@
+# // ---------------------------------------------------------------------
+# // ------- [Libs] Loop Lag
+# // ---------------------------------------------------------------------
+
+"""
+A module for measuring how long the event loop is blocked for.
+Repo: https://github.com/cuhHub/ArcheanBot
+
+---
+
+Copyright (C) 2024 Cuh4
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+# ---- // Imports
+import asyncio
+import time
+from collections import deque
+
+# ---- // Main
+class LoopLagMonitor():
+    """
+    A class for measuring event loop lag.
+    Sleeps for a fixed interval over and over, and records how much later than expected each sleep finished. Anything blocking the event loop shows up as lag.
+    """
+
+    def __init__(self, interval: float = 0.5, samples: int = 120):
+        """
+        Initializes `LoopLagMonitor` class objects.
+
+        Args:
+            interval (float, optional): How often to measure in seconds. Defaults to 0.5.
+            samples (int, optional): How many recent measurements to keep. Defaults to 120.
+        """
+
+        self.interval = interval
+        self.lags: deque[float] = deque(maxlen = samples)
+
+        self._task: asyncio.Task|None = None
+
+    @property
+    def last(self) -> float:
+        """
+        Returns the most recent lag measurement.
+
+        Returns:
+            float: The lag in seconds.
+        """
+
+        return self.lags[-1] if len(self.lags) > 0 else 0
+
+    @property
+    def average(self) -> float:
+        """
+        Returns the average of the recent lag measurements.
+
+        Returns:
+            float: The lag in seconds.
+        """
+
+        if len(self.lags) == 0:
+            return 0
+
+        return sum(self.lags) / len(self.lags)
+
+    @property
+    def max(self) -> float:
+        """
+        Returns the highest of the recent lag measurements.
+
+        Returns:
+            float: The lag in seconds.
+        """
+
+        return max(self.lags, default = 0)
+
+    def start(self):
+        """
+        Starts measuring. Does nothing if already started.
+        """
+
+        if self._task is not None and not self._task.done():
+            return
+
+        self._task = asyncio.create_task(self._run())
+
+    def stop(self):
+        """
+        Stops measuring.
+        """
+
+        if self._task is None:
+            return
+
+        self._task.cancel()
+        self._task = None
+
+    async def _run(self):
+        """
+        Measures forever.
+        """
+
+        while True:
+            started_at = time.perf_counter()
+            await asyncio.sleep(self.interval)
+
+            self.lags.append(max(0, time.perf_counter() - started_at - self.interval))
@@ -0,0 +1,411 @@
+# // ---------------------------------------------------------------------
+# // ------- [Libs] Outbound
+# // ---------------------------------------------------------------------
+
+"""
+A module for scheduling outbound Discord requests by rate limit bucket.
+Repo: https://github.com/cuhHub/ArcheanBot
+
+---
+
+Copyright (C) 2024 Cuh4
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+# ---- // Imports
+from __future__ import annotations
+
+import asyncio
+import discord
+import heapq
+import itertools
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from enum import IntEnum
+from typing import Awaitable, Callable
+
+# ---- // Main
+class Priority(IntEnum):
+    """
+    The priority of an outbound request. Lower values are sent first.
+    """
+
+    INTERACTIVE = 0
+    BACKGROUND = 1
+
+@dataclass(order = True)
+class _Operation():
+    """
+    A queued outbound request.
+    """
+
+    priority: int
+    sequence: int
+    bucket: str = field(compare = False)
+    factory: Callable[[], Awaitable[any]] = field(compare = False)
+    future: asyncio.Future = field(compare = False)
+    coalesce_key: str|None = field(default = None, compare = False)
+    queued_at: float = field(default_factory = time.monotonic, compare = False)
+
+class OutboundScheduler():
+    """
+    A class for sending Discord requests through a shared queue.
+
+    Requests in the same rate limit bucket (e.g. the same channel) are sent one at a time, while different buckets are sent concurrently.
+    Interactive requests are sent before background ones, and repeated edits to the same message are collapsed so only the latest is sent.
+    Some workers only send interactive requests, so interactions are still answered while every other worker is stuck on slow background requests.
+
+    >>> outbound = OutboundScheduler(max_concurrency = 4, interactive_workers = 1)
+    >>> await outbound.edit(message, embed = embed)
+    """
+
+    def __init__(self, max_concurrency: int = 4, interactive_workers: int = 1):
+        """
+        Initializes `OutboundScheduler` class objects.
+
+        Args:
+            max_concurrency (int, optional): The maximum amount of requests sent at once across all buckets. Defaults to 4.
+            interactive_workers (int, optional): How many of those workers only send interactive requests. At least one worker is always left for background requests. Defaults to 1.
+        """
+
+        self.max_concurrency = max_concurrency
+        self.interactive_workers = max(0, min(interactive_workers, max_concurrency - 1))
+
+        self.sent = 0
+        self.failed = 0
+        self.coalesced = 0
+        self.wait_times: deque[float] = deque(maxlen = 100)
+
+        self._pending: dict[str, list[_Operation]] = {}
+        self._ready: list[tuple[int, int, str]] = []
+        self._busy: set[str] = set()
+        self._coalescable: dict[str, _Operation] = {}
+        self._sequence = itertools.count()
+        self._wakeup: asyncio.Event|None = None
+        self._workers: list[asyncio.Task] = []
+
+    @property
+    def queue_depth(self) -> int:
+        """
+        Returns the amount of requests waiting to be sent.
+
+        Returns:
+            int: The queue depth.
+        """
+
+        return sum(len(operations) for operations in self._pending.values())
+
+    @property
+    def average_wait(self) -> float:
+        """
+        Returns the average time recent requests spent queued before being sent.
+
+        Returns:
+            float: The average wait time in seconds.
+        """
+
+        if len(self.wait_times) == 0:
+            return 0
+
+        return sum(self.wait_times) / len(self.wait_times)
+
+    @property
+    def max_wait(self) -> float:
+        """
+        Returns the longest time a recent request spent queued before being sent.
+
+        Returns:
+            float: The max wait time in seconds.
+        """
+
+        return max(self.wait_times, default = 0)
+
+    def _start(self):
+        """
+        Starts the workers if they aren't running. Must be called within a running event loop.
+        """
+
+        if self._wakeup is None:
+            self._wakeup = asyncio.Event()
+
+        if len(self._workers) > 0:
+            return
+
+        self._workers = [
+            asyncio.create_task(self._worker(interactive_only = index < self.interactive_workers))
+            for index in range(self.max_concurrency)
+        ]
+
+    async def stop(self):
+        """
+        Stops the workers. Requests that haven't been sent yet, or were still being sent, are cancelled so nothing waiting on them hangs.
+        """
+
+        for worker in self._workers:
+            worker.cancel()
+
+        await asyncio.gather(*self._workers, return_exceptions = True)
+        self._workers = []
+
+        for operations in self._pending.values():
+            for operation in operations:
+                operation.future.cancel()
+
+        self._pending.clear()
+        self._ready.clear()
+        self._busy.clear()
+        self._coalescable.clear()
+
+    def _mark_ready(self, bucket: str):
+        """
+        Marks a bucket as ready to send its next request, if it has one and isn't busy.
+
+        Args:
+            bucket (str): The bucket.
+        """
+
+        operations = self._pending.get(bucket)
+
+        if not operations or bucket in self._busy:
+            return
+
+        head = operations[0]
+        heapq.heappush(self._ready, (head.priority, head.sequence, bucket))
+
+    def _take(self, interactive_only: bool = False) -> _Operation|None:
+        """
+        Takes the highest priority request whose bucket isn't busy.
+
+        Args:
+            interactive_only (bool, optional): Whether to only take interactive requests. Defaults to False.
+
+        Returns:
+            _Operation|None: The request, or None if there is nothing to send.
+        """
+
+        while len(self._ready) > 0:
+            priority, _, bucket = self._ready[0]
+
+            # entries are never removed in place, so skip any that are out of date (an up to date entry is always pushed when a bucket's next request changes)
+            operations = self._pending.get(bucket)
+
+            if not operations or bucket in self._busy or operations[0].priority != priority:
+                heapq.heappop(self._ready)
+                continue
+
+            # the ready queue is ordered by priority, so nothing interactive is left
+            if interactive_only and priority > Priority.INTERACTIVE:
+                return None
+
+            heapq.heappop(self._ready)
+            operation = heapq.heappop(operations)
+
+            if len(operations) == 0:
+                self._pending.pop(bucket)
+
+            if operation.coalesce_key is not None:
+                self._coalescable.pop(operation.coalesce_key, None)
+
+            self._busy.add(bucket)
+            return operation
+
+        return None
+
+    async def _worker(self, interactive_only: bool = False):
+        """
+        Sends requests forever.
+
+        Args:
+            interactive_only (bool, optional): Whether to only send interactive requests. Defaults to False.
+        """
+
+        while True:
+            operation = self._take(interactive_only)
+
+            if operation is None:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+
+            self.wait_times.append(time.monotonic() - operation.queued_at)
+
+            try:
+                result = await operation.factory()
+            except asyncio.CancelledError:
+                # stopped mid-send
+                operation.future.cancel()
+                raise
+            except Exception as error:
+                self.failed += 1
+
+                if not operation.future.done():
+                    operation.future.set_exception(error)
+            else:
+                self.sent += 1
+
+                if not operation.future.done():
+                    operation.future.set_result(result)
+            finally:
+                self._busy.discard(operation.bucket)
+                self._mark_ready(operation.bucket)
+                self._wakeup.set()
+
+    def submit(self, factory: Callable[[], Awaitable[any]], bucket: str, priority: Priority = Priority.BACKGROUND, coalesce_key: str = None) -> asyncio.Future:
+        """
+        Queues a request.
+
+        Args:
+            factory (Callable[[], Awaitable[any]]): A function returning the coroutine that sends the request. Only called when the request is sent.
+            bucket (str): The rate limit bucket of the request.
+            priority (Priority, optional): The priority of the request. Defaults to Priority.BACKGROUND.
+            coalesce_key (str, optional): If a request with the same key is still queued, it is replaced by this one. Defaults to None.
+
+        Returns:
+            asyncio.Future: A future resolved with the result of the request.
+        """
+
+        self._start()
+
+        # Replace the queued request instead of queueing another one
+        existing = self._coalescable.get(coalesce_key) if coalesce_key is not None else None
+
+        if existing is not None:
+            self.coalesced += 1
+            existing.factory = factory
+
+            if priority < existing.priority:
+                existing.priority = priority
+                heapq.heapify(self._pending[existing.bucket])
+                self._notify(existing.bucket)
+
+            return existing.future
+
+        # Queue
+        operation = _Operation(
+            priority = priority,
+            sequence = next(self._sequence),
+            bucket = bucket,
+            factory = factory,
+            future = asyncio.get_running_loop().create_future(),
+            coalesce_key = coalesce_key
+        )
+
+        heapq.heappush(self._pending.setdefault(bucket, []), operation)
+
+        if coalesce_key is not None:
+            self._coalescable[coalesce_key] = operation
+
+        self._notify(bucket)
+        return operation.future
+
+    def _notify(self, bucket: str):
+        """
+        Marks a bucket as ready and wakes up the workers.
+
+        Args:
+            bucket (str): The bucket.
+        """
+
+        self._mark_ready(bucket)
+        self._wakeup.set()
+
+    async def send(self, channel: discord.abc.Messageable, priority: Priority = Priority.BACKGROUND, **kwargs) -> discord.Message:
+        """
+        Queues a message to be sent to a channel, and waits for it to be sent.
+
+        Args:
+            channel (discord.abc.Messageable): The channel to send the message to.
+            priority (Priority, optional): The priority of the message. Defaults to Priority.BACKGROUND.
+            **kwargs: Passed to `channel.send(...)`.
+
+        Returns:
+            discord.Message: The sent message.
+        """
+
+        return await self.submit(
+            lambda: channel.send(**kwargs),
+            bucket = f"channel:{channel.id}",
+            priority = priority
+        )
+
+    async def edit(self, message: discord.Message, priority: Priority = Priority.BACKGROUND, **kwargs) -> discord.Message:
+        """
+        Queues a message edit, and waits for it to be sent.
+        If an edit to the same message is already queued, it is replaced by this one.
+
+        Args:
+            message (discord.Message): The message to edit.
+            priority (Priority, optional): The priority of the edit. Defaults to Priority.BACKGROUND.
+            **kwargs: Passed to `message.edit(...)`.
+
+        Returns:
+            discord.Message: The edited message.
+        """
+
+        return await self.submit(
+            lambda: message.edit(**kwargs),
+            bucket = f"channel:{message.channel.id}",
+            priority = priority,
+            coalesce_key = f"edit:{message.id}"
+        )
+
+    async def reply(self, interaction: discord.Interaction, **kwargs):
+        """
+        Queues a response to an interaction ahead of background requests, and waits for it to be sent.
+
+        Args:
+            interaction (discord.Interaction): The interaction to respond to.
+            **kwargs: Passed to `interaction.response.send_message(...)`.
+        """
+
+        return await self.submit(
+            lambda: interaction.response.send_message(**kwargs),
+            bucket = f"interaction:{interaction.id}",
+            priority = Priority.INTERACTIVE
+        )
+
+    async def defer(self, interaction: discord.Interaction, **kwargs):
+        """
+        Queues a deferral of an interaction ahead of background requests, and waits for it to be sent.
+        Used when a response will take longer than Discord allows, followed by `followup(...)`.
+
+        Args:
+            interaction (discord.Interaction): The interaction to defer.
+            **kwargs: Passed to `interaction.response.defer(...)`.
+        """
+
+        return await self.submit(
+            lambda: interaction.response.defer(**kwargs),
+            bucket = f"interaction:{interaction.id}",
+            priority = Priority.INTERACTIVE
+        )
+
+    async def followup(self, interaction: discord.Interaction, **kwargs) -> discord.WebhookMessage:
+        """
+        Queues a followup message to an interaction ahead of background requests, and waits for it to be sent.
+
+        Args:
+            interaction (discord.Interaction): The interaction to follow up.
+            **kwargs: Passed to `interaction.followup.send(...)`.
+
+        Returns:
+            discord.WebhookMessage: The sent message.
+        """
+
+        return await self.submit(
+            lambda: interaction.followup.send(**kwargs),
+            bucket = f"interaction:{interaction.id}",
+            priority = Priority.INTERACTIVE
+        )
@@ -0,0 +1,423 @@
+# // ---------------------------------------------------------------------
+# // ------- [Libs] Poller
+# // ---------------------------------------------------------------------
+
+"""
+A module for polling an Archean server and publishing events when it changes.
+Repo: https://github.com/cuhHub/ArcheanBot
+
+---
+
+Copyright (C) 2024 Cuh4
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+# ---- // Imports
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import time
+from dataclasses import dataclass
+from typing import Callable
+
+from libs import print
+from libs.archean import (
+    Archean,
+    Server,
+    ServerSnapshot,
+    InvalidSchema
+)
+
+from libs.event_bus import EventBus
+from libs.scheduler import Scheduler
+
+# ---- // Events
+@dataclass
+class ServerPolled():
+    """
+    Published after every successful poll, whether or not anything changed.
+    """
+
+    server: Server|None
+    snapshot: ServerSnapshot
+
+@dataclass
+class PollFailed():
+    """
+    Published when fetching the server list fails.
+    """
+
+    error: Exception
+
+@dataclass
+class ServerOnline():
+    """
+    Published when the server is seen for the first time, or comes back after being offline.
+    """
+
+    server: Server
+
+@dataclass
+class ServerOffline():
+    """
+    Published when the server disappears from the server list.
+    """
+
+    previous: Server
+
+@dataclass
+class PlayerCountChanged():
+    """
+    Published when the server's player count changes.
+    """
+
+    server: Server
+    previous_count: int
+    count: int
+
+@dataclass
+class VersionChanged():
+    """
+    Published when the server's version changes.
+    """
+
+    server: Server
+    previous_version: int
+    version: int
+
+@dataclass
+class MaxPlayersChanged():
+    """
+    Published when the server's max player count changes.
+    """
+
+    server: Server
+    previous_max_players: int
+    max_players: int
+
+# ---- // Main
+class Poller():
+    """
+    A class for polling an Archean server once per tick and publishing events on what changed since the previous tick.
+
+    The interval adapts to activity. It drops to `min_interval` whenever something changed or a hint asks for it (e.g. someone is waiting for a player count the server is close to), and backs off towards `max_interval` by `backoff` each quiet tick, including while the server is offline or unreachable.
+
+    If a cache path is provided, the last snapshot is saved to disk whenever something changes (and at least every `cache_interval` seconds), and loaded with `load_cache` on startup. That way, there is something to show and diff against before the first poll after a restart.
+    """
+
+    def __init__(
+        self,
+        archean: Archean,
+        events: EventBus,
+        scheduler: Scheduler,
+        ip: str,
+        port: int,
+        min_interval: float,
+        max_interval: float = None,
+        backoff: float = 1.5,
+        cache_path: str|None = None,
+        cache_interval: float = 60
+    ):
+        """
+        Initializes `Poller` class objects.
+
+        Args:
+            archean (Archean): The Archean client to fetch servers with.
+            events (EventBus): The event bus to publish events to.
+            scheduler (Scheduler): The scheduler to poll with. Polls run as the `poll` job, in the `server` group so jobs reading the latest poll can line up with it.
+            ip (str): The IP of the server to poll.
+            port (int): The port of the server to poll.
+            min_interval (float): How often to poll while the server is active in seconds.
+            max_interval (float, optional): How often to poll while the server is idle or offline in seconds. Defaults to `min_interval`.
+            backoff (float, optional): How much the interval is multiplied by each quiet tick. Defaults to 1.5.
+            cache_path (str|None, optional): Where to save the last snapshot. Defaults to None (not saved).
+            cache_interval (float, optional): The longest time between saves while nothing changes in seconds. Defaults to 60.
+        """
+
+        self.archean = archean
+        self.events = events
+        self.ip = ip
+        self.port = port
+
+        self.min_interval = min_interval
+        self.max_interval = max(min_interval, max_interval or min_interval)
+        self.backoff = backoff
+        self.hints: list[Callable[[Server], bool]] = []
+
+        self.cache_path = cache_path
+        self.cache_interval = cache_interval
+        self.cached_at = 0
+
+        self.server: Server|None = None
+        self.last_online: Server|None = None
+        self.failed = False
+        self.polled = False
+        self.stale = False # True while the Archean API is unreachable and the last good snapshot is being served, or before the first poll after loading the cache
+        self.fetched_at: float|None = None
+
+        self.job = scheduler.add_job("poll", self.tick, interval = min_interval, group = "server")
+
+    @property
+    def running(self) -> bool:
+        """
+        Returns whether or not the poller is running.
+
+        Returns:
+            bool: True if running.
+        """
+
+        return self.job.enabled
+
+    @property
+    def interval(self) -> float:
+        """
+        Returns how often the server is currently polled.
+
+        Returns:
+            float: The interval in seconds.
+        """
+
+        return self.job.interval
+
+    @property
+    def polls_per_minute(self) -> float:
+        """
+        Returns how many times a minute the server is currently polled.
+
+        Returns:
+            float: The rate.
+        """
+
+        return 60 / self.job.interval
+
+    def add_hint(self, hint: Callable[[Server], bool]):
+        """
+        Registers a function that is asked after each poll whether the server should be polled quickly.
+
+        Args:
+            hint (Callable[[Server], bool]): Called with the polled server (only while online). Returns True to poll at `min_interval`.
+        """
+
+        self.hints.append(hint)
+
+    def adapt(self, active: bool):
+        """
+        Adjusts the polling interval after a tick.
+
+        Args:
+            active (bool): Whether or not anything changed this tick.
+        """
+
+        server = self.server
+
+        if not active and server is not None and not self.failed:
+            active = any(hint(server) for hint in self.hints)
+
+        if active:
+            self.job.set_interval(self.min_interval)
+        else:
+            self.job.set_interval(min(self.max_interval, self.job.interval * self.backoff))
+
+    def start(self):
+        """
+        Starts polling. Does nothing if the poller is already running.
+        """
+
+        self.job.start()
+
+    def stop(self):
+        """
+        Stops polling.
+        """
+
+        self.job.stop()
+
+    def load_cache(self) -> bool:
+        """
+        Loads the snapshot saved before the last shutdown, using it as the latest poll until the first real one.
+        Snapshots older than the Archean client's `stale_ttl` are ignored.
+
+        Returns:
+            bool: True if a snapshot was loaded.
+        """
+
+        if not self.cache_path or not os.path.exists(self.cache_path):
+            return False
+
+        try:
+            with open(self.cache_path, "r") as file:
+                data = json.load(file)
+
+            snapshot = ServerSnapshot.from_dict(data["snapshot"])
+            last_online = Server._from_dict(data["last_online"]) if data.get("last_online") is not None else None
+        except (OSError, ValueError, KeyError, TypeError, InvalidSchema) as error:
+            print.error("Poller", f"Failed to load cached snapshot: {error}")
+            return False
+
+        if snapshot.age >= self.archean.stale_ttl:
+            return False
+
+        self.archean.restore_snapshot(snapshot)
+
+        self.server = snapshot.get_server_by_ip(self.ip, self.port)
+        self.last_online = self.server or last_online
+        self.polled = True
+        self.stale = snapshot.age >= self.archean.cache_ttl
+        self.fetched_at = snapshot.fetched_at
+        self.cached_at = snapshot.fetched_at
+
+        return True
+
+    def _get_cache(self, snapshot: ServerSnapshot) -> dict:
+        """
+        Returns the data to save to the cache.
+
+        Args:
+            snapshot (ServerSnapshot): The latest snapshot.
+
+        Returns:
+            dict: The data.
+        """
+
+        return {
+            "snapshot" : snapshot.to_dict(),
+            "last_online" : self.last_online._to_dict() if self.last_online is not None else None
+        }
+
+    def _write_cache(self, data: dict):
+        """
+        Writes data to the cache file, replacing the old one in one step.
+
+        Args:
+            data (dict): The data.
+        """
+
+        directory = os.path.dirname(self.cache_path)
+
+        if directory:
+            os.makedirs(directory, exist_ok = True)
+
+        temporary_path = self.cache_path + ".tmp"
+
+        with open(temporary_path, "w") as file:
+            json.dump(data, file)
+            file.flush()
+            os.fsync(file.fileno())
+
+        os.replace(temporary_path, self.cache_path)
+
+    def save_cache(self, snapshot: ServerSnapshot|None = None):
+        """
+        Saves a snapshot to the cache file, blocking until it is written. Used on shutdown.
+
+        Args:
+            snapshot (ServerSnapshot|None, optional): The snapshot. Defaults to the Archean client's cached snapshot.
+        """
+
+        snapshot = snapshot or self.archean.last_snapshot
+
+        if not self.cache_path or snapshot is None:
+            return
+
+        try:
+            self._write_cache(self._get_cache(snapshot))
+            self.cached_at = snapshot.fetched_at
+        except OSError as error:
+            print.error("Poller", f"Failed to save snapshot: {error}")
+
+    async def tick(self):
+        """
+        Fetches the server list once and publishes events for anything that changed.
+        """
+
+        try:
+            snapshot = await self.archean.get_snapshot()
+        except Exception as error:
+            self.failed = True
+            self.adapt(active = False)
+
+            self.events.publish(PollFailed(error = error))
+            return
+
+        self.failed = False
+        self.polled = True
+        self.stale = snapshot.stale
+        self.fetched_at = snapshot.fetched_at
+
+        # nothing is known to have changed, so keep the server as it was instead of diffing old data
+        if snapshot.stale:
+            self.adapt(active = False)
+            return
+
+        previous = self.server
+        server = snapshot.get_server_by_ip(self.ip, self.port)
+        self.server = server
+
+        events = self.diff(previous, server)
+        self.adapt(active = len(events) > 0)
+
+        for event in events:
+            self.events.publish(event)
+
+        if server is not None:
+            self.last_online = server
+
+        if self.cache_path and (len(events) > 0 or snapshot.fetched_at - self.cached_at >= self.cache_interval):
+            self.cached_at = snapshot.fetched_at
+
+            try:
+                await asyncio.to_thread(self._write_cache, self._get_cache(snapshot))
+            except OSError as error:
+                print.error("Poller", f"Failed to save snapshot: {error}")
+
+        self.events.publish(ServerPolled(server = server, snapshot = snapshot))
+
+    def diff(self, previous: Server|None, server: Server|None) -> list:
+        """
+        Returns the events describing the change from the previous tick to this one.
+        Player count, version and max player changes are compared against the last time the server was online, so they carry over offline periods.
+
+        Args:
+            previous (Server|None): The server as of the previous tick.
+            server (Server|None): The server as of this tick.
+
+        Returns:
+            list: The events, in the order they should be published.
+        """
+
+        if server is None:
+            return [ServerOffline(previous = previous)] if previous is not None else []
+
+        events = []
+
+        if previous is None:
+            events.append(ServerOnline(server = server))
+
+        last = self.last_online
+
+        if last is None:
+            return events
+
+        if last.players != server.players:
+            events.append(PlayerCountChanged(server = server, previous_count = last.players, count = server.players))
+
+        if last.max_players != server.max_players:
+            events.append(MaxPlayersChanged(server = server, previous_max_players = last.max_players, max_players = server.max_players))
+
+        if last.version != server.version:
+            events.append(VersionChanged(server = server, previous_version = last.version, version = server.version))
+
+        return events
@@ -0,0 +1,547 @@
+# // ---------------------------------------------------------------------
+# // ------- [Libs] Scheduler
+# // ---------------------------------------------------------------------
+
+"""
+A module for running periodic jobs from one shared timer.
+Repo: https://github.com/cuhHub/ArcheanBot
+
+---
+
+Copyright (C) 2024 Cuh4
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+# ---- // Imports
+from __future__ import annotations
+
+import asyncio
+import math
+import random
+import time
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Literal
+
+from libs import print
+
+# ---- // Variables
+MissedTickPolicy = Literal["skip", "coalesce", "catch_up"]
+
+# ---- // Main
+@dataclass
+class JobMetrics():
+    """
+    Timing measurements for a job.
+    """
+
+    runs: int = 0
+    failures: int = 0
+    timeouts: int = 0
+    skipped: int = 0 # ticks that were missed or dropped because the job was still running
+
+    last_run_time: float = 0
+    max_run_time: float = 0
+    total_run_time: float = 0
+
+    last_lateness: float = 0 # how long after its scheduled time the job was due and noticed
+    max_lateness: float = 0
+    total_lateness: float = 0
+    ticks: int = 0
+
+    @property
+    def average_run_time(self) -> float:
+        """
+        Returns the average time taken by a run.
+
+        Returns:
+            float: The time in seconds.
+        """
+
+        return self.total_run_time / self.runs if self.runs > 0 else 0
+
+    @property
+    def average_lateness(self) -> float:
+        """
+        Returns the average lateness of a tick.
+
+        Returns:
+            float: The lateness in seconds.
+        """
+
+        return self.total_lateness / self.ticks if self.ticks > 0 else 0
+
+    def record_run(self, run_time: float):
+        """
+        Records how long a run took.
+
+        Args:
+            run_time (float): The time in seconds.
+        """
+
+        self.runs += 1
+        self.last_run_time = run_time
+        self.max_run_time = max(self.max_run_time, run_time)
+        self.total_run_time += run_time
+
+    def record_lateness(self, lateness: float):
+        """
+        Records how late a tick was.
+
+        Args:
+            lateness (float): The lateness in seconds.
+        """
+
+        self.ticks += 1
+        self.last_lateness = lateness
+        self.max_lateness = max(self.max_lateness, lateness)
+        self.total_lateness += lateness
+
+class Job():
+    """
+    A periodic job registered with a `Scheduler`. Created with `Scheduler.add_job`.
+    """
+
+    def __init__(
+        self,
+        scheduler: Scheduler,
+        name: str,
+        callback: Callable[[], Awaitable],
+        interval: float,
+        jitter: float,
+        missed: MissedTickPolicy,
+        max_concurrency: int,
+        deadline: float|None,
+        group: str|None
+    ):
+        """
+        Initializes `Job` class objects.
+
+        Args:
+            scheduler (Scheduler): The scheduler the job belongs to.
+            name (str): The name of the job.
+            callback (Callable[[], Awaitable]): The coroutine function to run.
+            interval (float): How often to run in seconds.
+            jitter (float): The most each run is randomly delayed by in seconds.
+            missed (MissedTickPolicy): What to do with ticks missed while late or still running.
+            max_concurrency (int): The most runs allowed at once.
+            deadline (float|None): How long a run may take in seconds before it is cancelled. None for no limit.
+            group (str|None): The group to align runs with.
+        """
+
+        self.scheduler = scheduler
+        self.name = name
+        self.callback = callback
+        self.interval = interval
+        self.jitter = jitter
+        self.missed = missed
+        self.max_concurrency = max_concurrency
+        self.deadline = deadline
+        self.group = group
+
+        self.enabled = False
+        self.due: float = 0 # the time of the next tick, without jitter
+        self.scheduled_at: float = 0 # the time of the next tick, with jitter
+        self.tick: int = 0 # the wheel tick the next tick is in
+
+        self.pending = 0
+        self.running = 0
+
+        self.metrics = JobMetrics()
+
+    def start(self):
+        """
+        Starts running the job. Does nothing if already started.
+        """
+
+        if self.enabled:
+            return
+
+        self.enabled = True
+        self.scheduler._schedule(self, self.scheduler._first_due(self))
+
+    def set_interval(self, interval: float):
+        """
+        Changes how often the job runs.
+        When shortened, the next tick is brought forward to match instead of waiting out the old interval.
+
+        Args:
+            interval (float): How often to run in seconds.
+        """
+
+        previous = self.due - self.interval # roughly when the last tick fired
+        self.interval = interval
+
+        if self.enabled and previous + interval < self.due:
+            self.scheduler._schedule(self, previous + interval)
+
+    def stop(self):
+        """
+        Stops running the job. Runs already in progress are left to finish.
+        """
+
+        if not self.enabled:
+            return
+
+        self.enabled = False
+        self.pending = 0
+        self.scheduler._unschedule(self)
+
+class Scheduler():
+    """
+    A class for running periodic jobs from one shared timer wheel instead of a timer per job.
+
+    The wheel is a ring of slots, each covering `resolution` seconds. Jobs sit in the slot of their next tick, and the scheduler wakes once per slot to run whatever is due.
+
+    When a job is late or still running at its next tick, its `missed` policy decides what happens:
+    - `skip`: the tick is dropped. Late jobs run once and carry on from the next tick.
+    - `coalesce`: missed ticks are merged into one run, started as soon as possible.
+    - `catch_up`: every missed tick is run, one after another.
+
+    Each job in a group runs at its own interval, but its ticks are counted from the scheduler's origin rather than from when it was started. Jobs in the same group therefore tick together whenever their intervals line up, and run one after another in the order they were added. This way, jobs reading data produced by the first job (e.g. the latest server poll) all see the same data.
+
+    >>> scheduler = Scheduler()
+    >>> scheduler.start()
+    >>> job = scheduler.add_job("poll", poll, interval = 2, group = "server")
+    >>> job.start()
+    """
+
+    def __init__(self, resolution: float = 0.25, slots: int = 512):
+        """
+        Initializes `Scheduler` class objects.
+
+        Args:
+            resolution (float, optional): How long each slot of the wheel covers in seconds. Jobs run up to this late. Defaults to 0.25.
+            slots (int, optional): The amount of slots in the wheel. Defaults to 512.
+        """
+
+        self.resolution = resolution
+        self.wheel: list[set[Job]] = [set() for _ in range(slots)]
+
+        self.jobs: dict[str, Job] = {}
+        self.groups: dict[str, Job] = {} # group name -> first job in the group
+
+        self.origin = time.monotonic()
+        self.tick = -1 # the last processed tick
+
+        self._task: asyncio.Task|None = None
+        self._runs: set[asyncio.Task] = set()
+
+    @property
+    def running(self) -> bool:
+        """
+        Returns whether or not the scheduler is running.
+
+        Returns:
+            bool: True if running.
+        """
+
+        return self._task is not None and not self._task.done()
+
+    def add_job(
+        self,
+        name: str,
+        callback: Callable[[], Awaitable],
+        interval: float,
+        jitter: float = 0,
+        missed: MissedTickPolicy = "skip",
+        max_concurrency: int = 1,
+        deadline: float|None = None,
+        group: str|None = None
+    ) -> Job:
+        """
+        Registers a job. The job doesn't run until it is started with `Job.start`.
+
+        Args:
+            name (str): The name of the job. Must be unique.
+            callback (Callable[[], Awaitable]): The coroutine function to run.
+            interval (float): How often to run in seconds.
+            jitter (float, optional): The most each run is randomly delayed by in seconds. Jobs in a group share the jitter of the group's first job. Defaults to 0.
+            missed (MissedTickPolicy, optional): What to do with ticks missed while late or still running. Defaults to "skip".
+            max_concurrency (int, optional): The most runs allowed at once. Defaults to 1.
+            deadline (float|None, optional): How long a run may take in seconds before it is cancelled. Defaults to None (no limit).
+            group (str|None, optional): The group to align runs with. Defaults to None.
+
+        Returns:
+            Job: The job.
+        """
+
+        if name in self.jobs:
+            raise ValueError(f"A job named `{name}` already exists.")
+
+        if missed not in ("skip", "coalesce", "catch_up"):
+            raise ValueError(f"Unknown missed tick policy: {missed}")
+
+        job = Job(self, name, callback, interval, jitter, missed, max_concurrency, deadline, group)
+        self.jobs[name] = job
+
+        if group is not None:
+            self.groups.setdefault(group, job)
+
+        return job
+
+    def get_metrics(self) -> dict[str, JobMetrics]:
+        """
+        Returns the metrics of every job.
+
+        Returns:
+            dict[str, JobMetrics]: Job name -> metrics.
+        """
+
+        return {name : job.metrics for name, job in self.jobs.items()}
+
+    def start(self):
+        """
+        Starts the scheduler. Does nothing if already running.
+        """
+
+        if self.running:
+            return
+
+        self._task = asyncio.create_task(self._run())
+
+    def stop(self):
+        """
+        Stops the scheduler, cancelling any runs in progress.
+        """
+
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+        for run in self._runs:
+            run.cancel()
+
+    def _tick_of(self, at: float) -> int:
+        """
+        Returns the wheel tick a time falls in, rounding up.
+
+        Args:
+            at (float): The time (`time.monotonic()`).
+
+        Returns:
+            int: The tick.
+        """
+
+        return math.ceil((at - self.origin) / self.resolution - 1e-9) # tolerate float error in times built from repeated additions
+
+    def _align(self, job: Job, at: float) -> float:
+        """
+        Rounds a time to the job's nearest tick counted from the scheduler's origin, if the job is in a group.
+        Rounding to the nearest tick rather than up keeps the gap around an interval change close to the new interval.
+
+        Args:
+            job (Job): The job.
+            at (float): The time.
+
+        Returns:
+            float: The aligned time.
+        """
+
+        if job.group is None:
+            return at
+
+        return self.origin + round((at - self.origin) / job.interval) * job.interval
+
+    def _first_due(self, job: Job) -> float:
+        """
+        Returns when a job that was just started should first run.
+        Ungrouped jobs run straight away. Grouped jobs wait for their next tick counted from the scheduler's origin.
+
+        Args:
+            job (Job): The job.
+
+        Returns:
+            float: The time.
+        """
+
+        now = time.monotonic()
+        due = self._align(job, now)
+
+        return due + job.interval if due < now else due
+
+    def _schedule(self, job: Job, due: float):
+        """
+        Places a job in the wheel.
+
+        Args:
+            job (Job): The job.
+            due (float): The time of the job's next tick, without jitter.
+        """
+
+        self._unschedule(job)
+
+        job.due = self._align(job, due)
+        job.scheduled_at = job.due
+
+        jitter = self.groups[job.group].jitter if job.group is not None else job.jitter
+
+        if jitter > 0:
+            # jobs in a group get the same offset for the same tick, keeping them together
+            job.scheduled_at += random.Random(f"{job.group or job.name}:{job.due:.3f}").uniform(0, jitter)
+
+        job.tick = max(self._tick_of(job.scheduled_at), self.tick + 1)
+        self.wheel[job.tick % len(self.wheel)].add(job)
+
+    def _unschedule(self, job: Job):
+        """
+        Removes a job from the wheel.
+
+        Args:
+            job (Job): The job.
+        """
+
+        self.wheel[job.tick % len(self.wheel)].discard(job)
+
+    def _fire(self, job: Job, now: float) -> int:
+        """
+        Handles a job's tick, applying its missed tick policy and scheduling its next tick.
+
+        Args:
+            job (Job): The job.
+            now (float): The current time.
+
+        Returns:
+            int: How many runs to start now.
+        """
+
+        job.metrics.record_lateness(max(0, now - job.scheduled_at))
+
+        missed = max(0, int((now - job.due) // job.interval))
+
+        if job.missed == "catch_up":
+            job.pending += 1 + missed
+        else:
+            job.metrics.skipped += missed
+
+            if job.missed == "coalesce" or job.running < job.max_concurrency:
+                job.pending = 1
+            else:
+                job.metrics.skipped += 1
+
+        self._schedule(job, job.due + (missed + 1) * job.interval)
+        return self._take(job)
+
+    def _take(self, job: Job) -> int:
+        """
+        Claims as many pending runs as the job's concurrency allows.
+
+        Args:
+            job (Job): The job.
+
+        Returns:
+            int: How many runs were claimed.
+        """
+
+        count = max(0, min(job.pending, job.max_concurrency - job.running))
+
+        job.pending -= count
+        job.running += count
+
+        return count
+
+    def _spawn(self, coroutine: Awaitable):
+        """
+        Runs a coroutine in the background, keeping a reference to it until it finishes.
+
+        Args:
+            coroutine (Awaitable): The coroutine.
+        """
+
+        task = asyncio.create_task(coroutine)
+
+        self._runs.add(task)
+        task.add_done_callback(self._runs.discard)
+
+    async def _execute(self, job: Job):
+        """
+        Runs a job once. `job.running` must already account for this run.
+
+        Args:
+            job (Job): The job.
+        """
+
+        started_at = time.perf_counter()
+
+        try:
+            if job.deadline is not None:
+                await asyncio.wait_for(job.callback(), job.deadline)
+            else:
+                await job.callback()
+        except asyncio.TimeoutError:
+            job.metrics.timeouts += 1
+            print.error("Scheduler", f"Job `{job.name}` took longer than its {job.deadline}s deadline and was cancelled.")
+        except Exception as error:
+            job.metrics.failures += 1
+            print.error("Scheduler", f"Job `{job.name}` failed: {error}")
+        finally:
+            job.metrics.record_run(time.perf_counter() - started_at)
+            job.running -= 1
+
+        # runs left over from coalesced or caught up ticks
+        if job.enabled:
+            for _ in range(self._take(job)):
+                self._spawn(self._execute(job))
+
+    async def _execute_group(self, runs: list[Job]):
+        """
+        Runs jobs one after another.
+
+        Args:
+            runs (list[Job]): The jobs, in the order to run them.
+        """
+
+        for job in runs:
+            await self._execute(job)
+
+    async def _run(self):
+        """
+        Turns the wheel forever.
+        """
+
+        while True:
+            now = time.monotonic()
+            current = math.floor((now - self.origin) / self.resolution)
+
+            # if the bot fell behind by more than a whole turn, every slot is visited once
+            due: list[Job] = []
+
+            for tick in range(max(self.tick + 1, current - len(self.wheel) + 1), current + 1):
+                slot = self.wheel[tick % len(self.wheel)]
+                ready = [job for job in slot if job.tick <= current]
+
+                slot.difference_update(ready)
+                due.extend(ready)
+
+            self.tick = current
+
+            # jobs in a group run one after another, in the order they were added
+            order = {job : index for index, job in enumerate(self.jobs.values())}
+            groups: dict[str, list[Job]] = {}
+
+            for job in sorted(due, key = lambda job: order.get(job, len(order))):
+                count = self._fire(job, now)
+
+                if count == 0:
+                    continue
+
+                if job.group is not None:
+                    groups.setdefault(job.group, []).extend([job] * count)
+                else:
+                    for _ in range(count):
+                        self._spawn(self._execute(job))
+
+            for runs in groups.values():
+                self._spawn(self._execute_group(runs))
+
+            await asyncio.sleep(max(0, self.origin + (current + 1) * self.resolution - time.monotonic()))
@@ -26,6 +26,8 @@ limitations under the License.
 # ---- // Imports
 from playhouse.sqliteq import SqliteQueueDatabase
 import os
+import subprocess
+import sys
 from dotenv import load_dotenv
 
 import models
@@ -38,16 +40,25 @@ from bot import Bot
 load_dotenv()
 
 # Create SQL database
-sql_database = SqliteQueueDatabase(os.getenv("sqldb_path"))
-models.latch(sql_database, models.all)
+sql_database = SqliteQueueDatabase(os.getenv("sqldb_path"), autostart = False)
+applied_migrations = models.latch(sql_database)
+sql_database.start() # started after migrating so the write thread's connection sees the migrated schema
 
-print.success("Database", "Created tables for DB: " + ", ".join([model.__name__ for model in models.all]))
+if len(applied_migrations) > 0:
+    print.success("Database", "Applied migrations: " + ", ".join(applied_migrations))
+else:
+    print.success("Database", f"Schema is up to date (version {models.migrations.LATEST_VERSION})")
 
 # Create JSON database
 json_database = json_db.Database(os.getenv("jsondb_path"), {
-    "status_message_id" : json_db.SchemaValue(value_type = int, default = 0)
-})
+    "status_message_id" : json_db.SchemaValue(value_type = int, default = 0),
+    "live_chat_player_count" : json_db.SchemaValue(value_type = int, default = -1)
+}, write_delay = float(os.getenv("jsondb_write_delay")))
 
 # Create bot
 bot = Bot(sql_database = sql_database, json_database = json_database)
-bot.run(token = os.getenv("bot_token"))
\ No newline at end of file
+bot.run(token = os.getenv("bot_token"))
+
+# Restart if requested (see /restart)
+if bot.restart_requested:
+    subprocess.Popen([sys.executable, *sys.argv])
\ No newline at end of file
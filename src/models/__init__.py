@@ -25,23 +25,45 @@ limitations under the License.
 
 # ---- // Imports
 import peewee
+import time
 proxy = peewee.DatabaseProxy()
 
+from .peak_cache import PeakCache
+peak_cache = PeakCache()
+
 from .server_statistic import ServerStatistic
+from .statistic_rollup import HourlyStatistic, DailyStatistic
 from .waitee import Waitee
+from .waitee_index import WaiteeIndex
+from .statistic_archive import StatisticArchive
+from .repository import Repository
+from .sample_writer import SampleWriter
+from . import migrations
 
 # ---- // Variables
 all = [model for model in locals().values() if isinstance(model, peewee.ModelBase)]
 
 # ---- // Functions
-def latch(database: peewee.Database, tables: list[peewee.ModelBase]):
+def latch(database: peewee.SqliteDatabase) -> list[str]:
     """
-    Initializes the database proxy and creates tables.
+    Brings the database's schema up to date, initializes the database proxy and seeds the peak cache.
+    Tables are created by the migrations, so nothing is created if the schema is already current.
 
     Args:
-        database (peewee.Database): The database to use.
-        tables (list[peewee.ModelBase]): The tables to create.
+        database (peewee.SqliteDatabase): The database to use.
+
+    Returns:
+        list[str]: The names of the migrations applied.
     """
     
+    applied = migrations.run(database.database)
     proxy.initialize(database)
-    database.create_tables(tables)
\ No newline at end of file
+    
+    all_time = DailyStatistic.get_peak()
+    
+    peak_cache.seed(
+        all_time = all_time.as_peak() if all_time is not None else None,
+        recent = [rollup.as_peak() for rollup in HourlyStatistic.get_since(time.time() - peak_cache.rollup_window)]
+    )
+    
+    return applied
@@ -0,0 +1,173 @@
+# // ---------------------------------------------------------------------
+# // ------- [Models] Migrations
+# // ---------------------------------------------------------------------
+
+"""
+Versioned schema migrations for the SQLite database.
+Repo: https://github.com/cuhHub/ArcheanBot
+
+---
+
+Copyright (C) 2024 Cuh4
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+# ---- // Imports
+from __future__ import annotations
+
+import peewee
+import time
+from typing import Callable
+from playhouse.migrate import SqliteMigrator, migrate
+
+from .server_statistic import ServerStatistic
+from .statistic_rollup import ROLLUPS
+from .waitee import Waitee
+
+# ---- // Models
+class SchemaVersion(peewee.Model):
+    """
+    A model recording each migration applied to the database.
+    """
+
+    version = peewee.IntegerField(primary_key = True)
+    name = peewee.TextField()
+    applied_at = peewee.FloatField(default = time.time)
+
+    class Meta:
+        table_name = "schema_version"
+
+# ---- // Migrations
+def create_tables(database: peewee.Database, migrator: SqliteMigrator):
+    """
+    Creates the original tables. Existing tables are left alone.
+
+    Args:
+        database (peewee.Database): The database being migrated.
+        migrator (SqliteMigrator): A migrator for the database.
+    """
+
+    for model in (ServerStatistic, Waitee):
+        model._schema.create_table(safe = True)
+
+def add_waitee_at_least(database: peewee.Database, migrator: SqliteMigrator):
+    """
+    Adds `Waitee.at_least`, unless the table was created with it.
+
+    Args:
+        database (peewee.Database): The database being migrated.
+        migrator (SqliteMigrator): A migrator for the database.
+    """
+
+    columns = {column.name for column in database.get_columns(Waitee._meta.table_name)}
+
+    if Waitee.at_least.column_name not in columns:
+        migrate(migrator.add_column(Waitee._meta.table_name, Waitee.at_least.column_name, Waitee.at_least))
+
+def add_indexes(database: peewee.Database, migrator: SqliteMigrator):
+    """
+    Indexes the columns used for lookups, and makes `Waitee.user_id` unique.
+    Users could previously end up with more than one Waitee record, so only their newest is kept.
+
+    Args:
+        database (peewee.Database): The database being migrated.
+        migrator (SqliteMigrator): A migrator for the database.
+    """
+
+    Waitee.delete().where(
+        Waitee.id.not_in(Waitee.select(peewee.fn.MAX(Waitee.id)).group_by(Waitee.user_id))
+    ).execute()
+
+    migrate(
+        migrator.add_index(ServerStatistic._meta.table_name, (ServerStatistic.time.column_name,)),
+        migrator.add_index(ServerStatistic._meta.table_name, (ServerStatistic.player_count.column_name,)),
+        migrator.add_index(Waitee._meta.table_name, (Waitee.user_id.column_name,), unique = True),
+        migrator.add_index(Waitee._meta.table_name, (Waitee.wants_player_count.column_name,))
+    )
+
+def add_statistic_rollups(database: peewee.Database, migrator: SqliteMigrator):
+    """
+    Creates the hourly and daily rollup tables, and fills them from existing ServerStatistic records.
+
+    Args:
+        database (peewee.Database): The database being migrated.
+        migrator (SqliteMigrator): A migrator for the database.
+    """
+
+    for rollup in ROLLUPS:
+        rollup.create_table(safe = True)
+        rollup.record(ServerStatistic.select().iterator())
+
+# ---- // Variables
+# Never reorder or remove migrations, only append. A migration's version is its position in this list.
+MIGRATIONS: list[Callable[[peewee.Database, SqliteMigrator], None]] = [
+    create_tables,
+    add_waitee_at_least,
+    add_indexes,
+    add_statistic_rollups
+]
+
+LATEST_VERSION = len(MIGRATIONS)
+
+# ---- // Functions
+def get_version(database: peewee.Database) -> int:
+    """
+    Returns the version of a database's schema.
+
+    Args:
+        database (peewee.Database): The database. `SchemaVersion` must be bound to it.
+
+    Returns:
+        int: The version, or 0 if no migrations have been applied.
+    """
+
+    if not database.table_exists(SchemaVersion._meta.table_name):
+        return 0
+
+    return SchemaVersion.select(peewee.fn.MAX(SchemaVersion.version)).scalar() or 0
+
+def run(path: str) -> list[str]:
+    """
+    Applies any migrations the database at the provided path hasn't had yet, in order.
+    Each migration is applied in its own transaction along with its `SchemaVersion` record, so a failed migration is rolled back and retried on the next startup.
+
+    Migrations use their own connection instead of the bot's database, since `SqliteQueueDatabase` doesn't support transactions.
+
+    Args:
+        path (str): The path to the SQLite database.
+
+    Returns:
+        list[str]: The names of the applied migrations.
+    """
+
+    database = peewee.SqliteDatabase(path, pragmas = {"journal_mode" : "wal"})
+    migrator = SqliteMigrator(database)
+    applied = []
+
+    with database.bind_ctx([SchemaVersion, ServerStatistic, Waitee, *ROLLUPS]), database:
+        version = get_version(database)
+
+        if version >= LATEST_VERSION:
+            return applied
+
+        SchemaVersion.create_table(safe = True)
+
+        for version, migration in enumerate(MIGRATIONS[version:], start = version + 1):
+            with database.atomic():
+                migration(database, migrator)
+                SchemaVersion.create(version = version, name = migration.__name__)
+
+            applied.append(migration.__name__)
+
+    return applied
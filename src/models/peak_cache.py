@@ -0,0 +1,159 @@
+# // ---------------------------------------------------------------------
+# // ------- [Models] Peak Cache
+# // ---------------------------------------------------------------------
+
+"""
+An in-memory cache of peak player counts, kept up to date as statistics are recorded.
+Repo: https://github.com/cuhHub/ArcheanBot
+
+---
+
+Copyright (C) 2024 Cuh4
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+# ---- // Imports
+from __future__ import annotations
+
+import threading
+import time
+
+from typing import TYPE_CHECKING, Iterable
+
+from libs.durations import (
+    HOUR,
+    WEEK
+)
+
+if TYPE_CHECKING:
+    from .server_statistic import ServerStatistic
+
+# ---- // Main
+class PeakCache():
+    """
+    An in-memory cache of peak player counts.
+
+    Seeded once on startup, then updated with every recorded statistic, so reading a peak never touches the database.
+    Alongside the all-time peak, the peak of each hour is kept for the last `rollup_window` seconds so peaks over recent windows (e.g. 24h, 7d) can be found from at most a few hundred hourly rollups.
+    """
+
+    def __init__(self, rollup_window: float = WEEK, bucket_size: float = HOUR):
+        """
+        Initializes `PeakCache` class objects.
+
+        Args:
+            rollup_window (float, optional): How far back hourly peaks are kept for in seconds. Defaults to a week.
+            bucket_size (float, optional): The size of each rollup in seconds. Defaults to an hour.
+        """
+
+        self.rollup_window = rollup_window
+        self.bucket_size = bucket_size
+
+        self.all_time: ServerStatistic|None = None
+        self.buckets: dict[int, ServerStatistic] = {}
+
+        self._lock = threading.Lock()
+
+    def _bucket(self, timestamp: float) -> int:
+        """
+        Returns the index of the rollup a timestamp falls in.
+
+        Args:
+            timestamp (float): The timestamp.
+
+        Returns:
+            int: The index.
+        """
+
+        return int(timestamp // self.bucket_size)
+
+    def _prune(self):
+        """
+        Removes rollups that have fallen out of the rollup window.
+        """
+
+        oldest = self._bucket(time.time() - self.rollup_window)
+
+        for bucket in [bucket for bucket in self.buckets if bucket < oldest]:
+            self.buckets.pop(bucket)
+
+    def seed(self, all_time: ServerStatistic|None, recent: Iterable[ServerStatistic]):
+        """
+        Seeds the cache, replacing anything already cached.
+
+        Args:
+            all_time (ServerStatistic|None): The record with the highest player count ever.
+            recent (Iterable[ServerStatistic]): Every record within the rollup window.
+        """
+
+        with self._lock:
+            self.all_time = None
+            self.buckets.clear()
+
+        for statistic in recent:
+            self.record(statistic)
+
+        with self._lock:
+            self.all_time = all_time
+
+    def record(self, statistic: ServerStatistic):
+        """
+        Updates the cache with a newly recorded statistic.
+
+        Args:
+            statistic (ServerStatistic): The statistic.
+        """
+
+        with self._lock:
+            if self.all_time is None or statistic.player_count > self.all_time.player_count:
+                self.all_time = statistic
+
+            bucket = self._bucket(statistic.time)
+            peak = self.buckets.get(bucket)
+
+            if peak is None or statistic.player_count > peak.player_count:
+                self.buckets[bucket] = statistic
+
+            self._prune()
+
+    def get_peak(self, window: float = None) -> ServerStatistic|None:
+        """
+        Returns the record with the highest player count.
+        Windows are rounded out to whole rollups, so a windowed peak may be up to `bucket_size` seconds older than the window.
+
+        Args:
+            window (float, optional): Only consider records from the last `window` seconds. Must not be longer than the rollup window. Defaults to all-time.
+
+        Returns:
+            ServerStatistic|None: The record, or None if there are no records.
+        """
+
+        if window is None:
+            return self.all_time
+
+        if window > self.rollup_window:
+            raise ValueError(f"Window is longer than the rollup window: {window} > {self.rollup_window}")
+
+        oldest = self._bucket(time.time() - window)
+        peak = None
+
+        with self._lock:
+            for bucket, statistic in self.buckets.items():
+                if bucket < oldest:
+                    continue
+
+                if peak is None or statistic.player_count > peak.player_count:
+                    peak = statistic
+
+        return peak
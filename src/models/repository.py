@@ -0,0 +1,289 @@
+# // ---------------------------------------------------------------------
+# // ------- [Models] Repository
+# // ---------------------------------------------------------------------
+
+"""
+An async data-access layer over the Peewee models, so queries don't block the event loop.
+Repo: https://github.com/cuhHub/ArcheanBot
+
+---
+
+Copyright (C) 2024 Cuh4
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+# ---- // Imports
+from __future__ import annotations
+
+import asyncio
+import discord
+import functools
+import peewee
+from concurrent.futures import ThreadPoolExecutor
+from playhouse.sqliteq import SqliteQueueDatabase
+from typing import BinaryIO, Callable, Literal
+
+from .server_statistic import ServerStatistic
+from .statistic_rollup import HourlyStatistic, DailyStatistic
+from .statistic_archive import StatisticArchive
+from .statistic_export import export_statistics
+from . import statistic_rollup
+from .waitee import Waitee
+
+# ---- // Main
+class Repository():
+    """
+    An async data-access layer over the Peewee models.
+
+    Reads run on a dedicated thread pool. Writes run on a single separate thread, which hands them to the database's write queue (when using `SqliteQueueDatabase`) and waits for the result, so slow writes never hold up reads.
+    Writes that must happen together run in a transaction on the write thread's own connection, since `SqliteQueueDatabase` doesn't support transactions.
+
+    >>> repository = Repository(database)
+    >>> hourly = await repository.get_hourly_statistics(since = time.time() - 86400)
+    """
+
+    def __init__(self, database: peewee.Database, read_workers: int = 4, archive: StatisticArchive|None = None):
+        """
+        Initializes `Repository` class objects.
+
+        Args:
+            database (peewee.Database): The database the models are bound to.
+            read_workers (int, optional): The amount of threads used for reads. Defaults to 4.
+            archive (StatisticArchive|None, optional): Where ServerStatistic records are archived to before being pruned. Defaults to None (records are deleted outright).
+        """
+
+        self.database = database
+        self.archive = archive
+
+        self.read_executor = ThreadPoolExecutor(max_workers = read_workers, thread_name_prefix = "db-read")
+        self.write_executor = ThreadPoolExecutor(max_workers = 1, thread_name_prefix = "db-write")
+
+        if isinstance(database, SqliteQueueDatabase):
+            self.transaction_database = peewee.SqliteDatabase(database.database, pragmas = {"journal_mode" : "wal"})
+        else:
+            self.transaction_database = database
+
+    async def _run(self, executor: ThreadPoolExecutor, function: Callable, *args, **kwargs) -> any:
+        """
+        Runs a function on an executor.
+
+        Args:
+            executor (ThreadPoolExecutor): The executor.
+            function (Callable): The function.
+
+        Returns:
+            any: The result of the function.
+        """
+
+        return await asyncio.get_running_loop().run_in_executor(executor, functools.partial(function, *args, **kwargs))
+
+    async def read(self, function: Callable, *args, **kwargs) -> any:
+        """
+        Runs a function that reads from the database on the read thread pool.
+
+        Args:
+            function (Callable): The function.
+
+        Returns:
+            any: The result of the function.
+        """
+
+        return await self._run(self.read_executor, function, *args, **kwargs)
+
+    async def write(self, function: Callable, *args, **kwargs) -> any:
+        """
+        Runs a function that writes to the database on the write thread.
+
+        Args:
+            function (Callable): The function.
+
+        Returns:
+            any: The result of the function.
+        """
+
+        return await self._run(self.write_executor, function, *args, **kwargs)
+
+    def close(self):
+        """
+        Waits for queued queries to finish, then shuts down the threads.
+        """
+
+        if self.transaction_database is not self.database:
+            self.write_executor.submit(self.transaction_database.close) # connections are per thread, so it must be closed from the write thread
+
+        self.read_executor.shutdown(wait = True)
+        self.write_executor.shutdown(wait = True)
+
+    # ---- // Server Statistics
+    async def create_statistics(self, statistics: list[ServerStatistic]):
+        """
+        Stores unsaved ServerStatistic records in one batch, and merges them into the rollups.
+        Both happen in one transaction, so a failed batch leaves nothing behind and can safely be retried.
+
+        Args:
+            statistics (list[ServerStatistic]): The unsaved records.
+        """
+
+        def create():
+            with self.transaction_database.atomic():
+                ServerStatistic.insert_batch(statistics, self.transaction_database)
+                statistic_rollup.record(statistics, self.transaction_database)
+
+        await self.write(create)
+
+    async def get_hourly_statistics(self, since: float) -> list[HourlyStatistic]:
+        """
+        Returns the hourly rollups from the provided time onwards.
+
+        Args:
+            since (float): The time to get rollups from.
+
+        Returns:
+            list[HourlyStatistic]: The rollups, oldest first.
+        """
+
+        return await self.read(HourlyStatistic.get_since, since)
+
+    async def get_daily_statistics(self, since: float) -> list[DailyStatistic]:
+        """
+        Returns the daily rollups from the provided time onwards.
+
+        Args:
+            since (float): The time to get rollups from.
+
+        Returns:
+            list[DailyStatistic]: The rollups, oldest first.
+        """
+
+        return await self.read(DailyStatistic.get_since, since)
+
+    async def prune_statistics(self, before: float|None, hourly_before: float|None, segment_size: int = 50000) -> tuple[int, int, int]:
+        """
+        Deletes old ServerStatistic records and hourly rollups. Daily rollups are kept forever.
+        If the repository has an archive, ServerStatistic records are archived before being deleted.
+
+        Args:
+            before (float|None): Delete ServerStatistic records recorded before this time. None keeps them all.
+            hourly_before (float|None): Delete hourly rollups of hours that started before this time. None keeps them all.
+            segment_size (int, optional): The most records archived per archive segment. Defaults to 50000.
+
+        Returns:
+            tuple[int, int, int]: The amount of ServerStatistic records archived, ServerStatistic records deleted, and hourly rollups deleted.
+        """
+
+        def prune() -> tuple[int, int, int]:
+            archived = 0
+
+            if before is not None and self.archive is not None:
+                query = ServerStatistic.select().where(ServerStatistic.time < before)
+
+                # records already archived by an earlier, interrupted prune are skipped
+                if self.archive.end is not None:
+                    query = query.where(ServerStatistic.time > self.archive.end)
+
+                for statistics in peewee.chunked(query.order_by(ServerStatistic.time).iterator(), segment_size):
+                    self.archive.append(statistics)
+                    archived += len(statistics)
+
+            return (
+                archived,
+                ServerStatistic.delete_before(before) if before is not None else 0,
+                HourlyStatistic.delete_before(hourly_before) if hourly_before is not None else 0
+            )
+
+        return await self.write(prune)
+
+    async def export_statistics(self, file: BinaryIO, format: Literal["csv", "jsonl"], start: float = None, end: float = None) -> int:
+        """
+        Streams ServerStatistic records, archived ones included, to a file as gzip-compressed CSV or JSONL.
+        Runs on the read thread pool in constant memory, however many records there are.
+
+        Args:
+            file (BinaryIO): The file to write to.
+            format (Literal["csv", "jsonl"]): The format.
+            start (float, optional): The earliest time. Defaults to the beginning.
+            end (float, optional): The latest time. Defaults to now.
+
+        Returns:
+            int: The amount of records written.
+        """
+
+        return await self.read(export_statistics, file, format, start = start, end = end, archive = self.archive)
+
+    # ---- // Waitees
+    async def get_waitees(self) -> list[Waitee]:
+        """
+        Returns every Waitee record.
+
+        Returns:
+            list[Waitee]: The records.
+        """
+
+        return await self.read(lambda: list(Waitee.select()))
+
+    async def create_waitee(self, user: discord.User, player_count: int, channel: discord.TextChannel, at_least: bool = False) -> Waitee:
+        """
+        Creates a Waitee record for the provided user.
+
+        Args:
+            user (discord.User): The user to create a Waitee record for.
+            player_count (int): The player count to wait for.
+            channel (discord.TextChannel): The channel to send the reminder to if sending via DMs didn't work.
+            at_least (bool, optional): Whether to remind the user once the player count is at least `player_count`. Defaults to False.
+
+        Returns:
+            Waitee: The created record.
+        """
+
+        return await self.write(Waitee.wait_for_count, user, player_count, channel, at_least = at_least)
+
+    async def delete_waitees(self, ids: list[int]) -> int:
+        """
+        Deletes the Waitee records with the provided IDs.
+
+        Args:
+            ids (list[int]): The IDs of the records to delete.
+
+        Returns:
+            int: The amount of records deleted.
+        """
+
+        return await self.write(Waitee.delete_by_ids, ids)
+
+    # ---- // Generic
+    async def save(self, record: peewee.Model) -> int:
+        """
+        Saves a record.
+
+        Args:
+            record (peewee.Model): The record.
+
+        Returns:
+            int: The amount of rows modified.
+        """
+
+        return await self.write(record.save)
+
+    async def delete(self, record: peewee.Model) -> int:
+        """
+        Deletes a record.
+
+        Args:
+            record (peewee.Model): The record.
+
+        Returns:
+            int: The amount of rows deleted.
+        """
+
+        return await self.write(record.delete_instance)
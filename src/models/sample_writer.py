@@ -0,0 +1,173 @@
+# // ---------------------------------------------------------------------
+# // ------- [Models] Sample Writer
+# // ---------------------------------------------------------------------
+
+"""
+A buffer that writes ServerStatistic records to the database in batches.
+Repo: https://github.com/cuhHub/ArcheanBot
+
+---
+
+Copyright (C) 2024 Cuh4
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+# ---- // Imports
+from __future__ import annotations
+
+import asyncio
+
+from libs import print
+from libs.archean import Server
+
+from . import peak_cache
+from .repository import Repository
+from .server_statistic import ServerStatistic
+
+# ---- // Main
+class SampleWriter():
+    """
+    A class for buffering ServerStatistic records in memory and writing them in batches.
+    A batch is written once `max_samples` records are buffered, or `max_delay` seconds after the first record was buffered, whichever is first.
+
+    The peak cache is updated as soon as a record is added, so peaks don't lag behind the buffer.
+
+    >>> writer = SampleWriter(repository, max_samples = 50, max_delay = 60)
+    >>> writer.add(server)
+    >>> await writer.close() # writes anything still buffered
+    """
+
+    def __init__(self, repository: Repository, max_samples: int = 50, max_delay: float = 60):
+        """
+        Initializes `SampleWriter` class objects.
+
+        Args:
+            repository (Repository): The repository to write through.
+            max_samples (int, optional): The amount of buffered records that triggers a write. Defaults to 50.
+            max_delay (float, optional): The longest a record is buffered for in seconds. Defaults to 60.
+        """
+
+        self.repository = repository
+        self.max_samples = max_samples
+        self.max_delay = max_delay
+
+        self.pending: list[ServerStatistic] = []
+
+        self.written = 0
+        self.batches = 0
+        self.failed = 0
+
+        self._lock = asyncio.Lock()
+        self._timer: asyncio.Task|None = None
+        self._flushes: set[asyncio.Task] = set()
+
+    def add(self, server: Server) -> ServerStatistic:
+        """
+        Buffers a ServerStatistic record created from an Archean Server object.
+
+        Args:
+            server (Server): The Archean Server object.
+
+        Returns:
+            ServerStatistic: The buffered record. It is unsaved until the next write.
+        """
+
+        statistic = ServerStatistic.from_server(server)
+
+        self.pending.append(statistic)
+        peak_cache.record(statistic)
+
+        if len(self.pending) >= self.max_samples:
+            self._flush_soon()
+        elif self._timer is None:
+            self._timer = asyncio.create_task(self._flush_later())
+
+        return statistic
+
+    def _flush_soon(self):
+        """
+        Starts a write in the background, cancelling the pending timed write.
+        """
+
+        self._cancel_timer()
+
+        task = asyncio.create_task(self.flush())
+        self._flushes.add(task)
+        task.add_done_callback(self._flushes.discard)
+
+    def _cancel_timer(self):
+        """
+        Cancels the pending timed write, if any.
+        """
+
+        if self._timer is None:
+            return
+
+        self._timer.cancel()
+        self._timer = None
+
+    async def _flush_later(self):
+        """
+        Writes the buffer after `max_delay` seconds.
+        """
+
+        await asyncio.sleep(self.max_delay)
+
+        self._timer = None
+        await self.flush()
+
+    async def flush(self) -> int:
+        """
+        Writes every buffered record in one batch.
+        If the write fails, the records are put back to be retried with the next batch.
+
+        Returns:
+            int: The amount of records written.
+        """
+
+        async with self._lock:
+            if len(self.pending) == 0:
+                return 0
+
+            samples, self.pending = self.pending, []
+
+            try:
+                await self.repository.create_statistics(samples)
+            except Exception as error:
+                self.failed += 1
+                self.pending[:0] = samples
+
+                print.error("Sample Writer", f"Failed to write {len(samples)} statistics, retrying later: {error}")
+
+                if self._timer is None:
+                    self._timer = asyncio.create_task(self._flush_later())
+
+                return 0
+
+            self.written += len(samples)
+            self.batches += 1
+
+            return len(samples)
+
+    async def close(self):
+        """
+        Writes anything still buffered. Called on shutdown.
+        """
+
+        self._cancel_timer()
+
+        await asyncio.gather(*self._flushes, return_exceptions = True)
+        await self.flush()
+
+        self._cancel_timer() # a failed write schedules a retry, which won't happen after shutdown
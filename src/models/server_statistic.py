@@ -38,8 +38,8 @@ class ServerStatistic(peewee.Model):
     A model containing data for server status, etc.
     """
 
-    time = peewee.FloatField(default = time.time)
-    player_count = peewee.IntegerField()
+    time = peewee.FloatField(default = time.time, index = True)
+    player_count = peewee.IntegerField(index = True)
     max_players = peewee.IntegerField()
     version = peewee.TextField()
     
@@ -47,33 +47,62 @@ class ServerStatistic(peewee.Model):
         database = proxy
         
     @classmethod
-    def get_peak_player_count(cls) -> ServerStatistic|None:
+    def delete_before(cls, timestamp: float) -> int:
         """
-        Returns the ServerStatistic record with the highest `player_count`. 
+        Deletes the ServerStatistic records recorded before the provided time.
+
+        Args:
+            timestamp (float): The time.
 
         Returns:
-            ServerStatistic|None: The record found, or none if none found.
+            int: The amount of records deleted.
         """
-
-        try:
-            return cls.select().order_by(cls.player_count.desc()).limit(1).get()
-        except peewee.DoesNotExist:
-            return None
+        
+        return cls.delete().where(cls.time < timestamp).execute()
         
     @classmethod
-    def create_from_server(cls, server: Server) -> ServerStatistic:
+    def from_server(cls, server: Server) -> ServerStatistic:
         """
-        Creates a ServerStatistic object and saves to the database from an Archean Server object.
+        Creates an unsaved ServerStatistic object from an Archean Server object.
 
         Args:
             server (Server): The Archean Server object.
-            
+
         Returns:
-            ServerStatistic: The created and stored ServerStatistic object.
+            ServerStatistic: The unsaved ServerStatistic object.
         """
         
-        return cls.create(
+        return cls(
             player_count = server.players,
             max_players = server.max_players,
             version = server.version
-        )
\ No newline at end of file
+        )
+        
+    @classmethod
+    def insert_batch(cls, statistics: list[ServerStatistic], database: peewee.Database|None = None) -> int:
+        """
+        Saves unsaved ServerStatistic objects to the database with as few queries as possible.
+        The objects' IDs are not set.
+
+        Args:
+            statistics (list[ServerStatistic]): The unsaved objects.
+            database (peewee.Database|None, optional): The database to run the queries on instead of the bound one, e.g. a connection in a transaction. Defaults to None.
+
+        Returns:
+            int: The amount of records saved.
+        """
+        
+        # chunked to stay under SQLite's variable limit
+        for chunk in peewee.chunked(statistics, 100):
+            cls.insert_many([
+                {
+                    "time" : statistic.time,
+                    "player_count" : statistic.player_count,
+                    "max_players" : statistic.max_players,
+                    "version" : statistic.version
+                }
+                
+                for statistic in chunk
+            ]).execute(database)
+            
+        return len(statistics)
@@ -0,0 +1,336 @@
+# // ---------------------------------------------------------------------
+# // ------- [Models] Statistic Archive
+# // ---------------------------------------------------------------------
+
+"""
+A compact, append-only on-disk archive for old server statistics.
+Repo: https://github.com/cuhHub/ArcheanBot
+
+---
+
+Copyright (C) 2024 Cuh4
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+# ---- // Imports
+from __future__ import annotations
+
+import bisect
+import itertools
+import json
+import mmap
+import os
+import sys
+import threading
+import zlib
+from array import array
+from dataclasses import dataclass, asdict
+from typing import Iterator
+
+from .server_statistic import ServerStatistic
+
+# ---- // Variables
+COLUMNS = ("time", "player_count", "max_players", "version")
+
+# ---- // Main
+@dataclass
+class ArchiveSegment():
+    """
+    The index entry of a segment within the archive.
+    """
+
+    offset: int # where the segment starts in the data file
+    start: float # the time of the first record
+    end: float # the time of the last record
+    count: int
+    columns: dict[str, tuple[int, int]] # column name -> (offset within the segment, compressed length)
+    versions: list[str] # the `version` column is stored as indices into this
+
+class StatisticArchive():
+    """
+    A compact, append-only archive of ServerStatistic records.
+
+    Records are stored in segments, each holding the records of one `append` call column by column.
+    Times are stored as milliseconds, and every numeric column is delta-encoded before being compressed with zlib, so slowly changing values take up next to nothing. Versions are stored as indices into a per-segment list.
+
+    Segments are appended to a single data file, and a small JSON index records where each one is and what time range it covers. Reads memory-map the data file and only decompress the columns of the segments overlapping the requested range.
+
+    >>> archive = StatisticArchive("../data/statistics.archive")
+    >>> archive.append(statistics)
+    >>> archive.read(start, end)
+    """
+
+    def __init__(self, path: str, compression_level: int = 9):
+        """
+        Initializes `StatisticArchive` class objects.
+
+        Args:
+            path (str): The path to the data file. The index is stored alongside it with an `.index` suffix.
+            compression_level (int, optional): The zlib compression level. Defaults to 9.
+        """
+
+        self.path = path
+        self.index_path = path + ".index"
+        self.compression_level = compression_level
+
+        self.segments: list[ArchiveSegment] = []
+        self._lock = threading.Lock()
+
+        self.load()
+
+    @property
+    def end(self) -> float|None:
+        """
+        Returns the time of the newest archived record.
+
+        Returns:
+            float|None: The time, or None if the archive is empty.
+        """
+
+        segments = self.segments
+        return segments[-1].end if len(segments) > 0 else None
+
+    @property
+    def count(self) -> int:
+        """
+        Returns the amount of archived records.
+
+        Returns:
+            int: The amount.
+        """
+
+        return sum(segment.count for segment in self.segments)
+
+    def load(self):
+        """
+        Loads the segment index from disk.
+        """
+
+        if not os.path.exists(self.index_path):
+            self.segments = []
+            return
+
+        with open(self.index_path, "r") as file:
+            self.segments = [
+                ArchiveSegment(**{**segment, "columns" : {name : tuple(location) for name, location in segment["columns"].items()}})
+                for segment in json.load(file)
+            ]
+
+    def _save_index(self, segments: list[ArchiveSegment]):
+        """
+        Writes the segment index to disk, replacing the old one in one step.
+
+        Args:
+            segments (list[ArchiveSegment]): The segments.
+        """
+
+        temporary_path = self.index_path + ".tmp"
+
+        with open(temporary_path, "w") as file:
+            json.dump([asdict(segment) for segment in segments], file)
+            file.flush()
+            os.fsync(file.fileno())
+
+        os.replace(temporary_path, self.index_path)
+
+    @staticmethod
+    def _encode(values: list[int], typecode: str) -> bytes:
+        """
+        Delta-encodes integers into little-endian bytes.
+
+        Args:
+            values (list[int]): The integers.
+            typecode (str): The `array` typecode to store each delta as.
+
+        Returns:
+            bytes: The encoded integers.
+        """
+
+        deltas = array(typecode, (value - previous for previous, value in zip(itertools.chain((0,), values), values)))
+
+        if sys.byteorder == "big":
+            deltas.byteswap()
+
+        return deltas.tobytes()
+
+    @staticmethod
+    def _decode(data: bytes, typecode: str) -> list[int]:
+        """
+        Decodes integers encoded with `_encode`.
+
+        Args:
+            data (bytes): The encoded integers.
+            typecode (str): The `array` typecode the deltas were stored as.
+
+        Returns:
+            list[int]: The integers.
+        """
+
+        deltas = array(typecode)
+        deltas.frombytes(data)
+
+        if sys.byteorder == "big":
+            deltas.byteswap()
+
+        return list(itertools.accumulate(deltas))
+
+    def append(self, statistics: list[ServerStatistic]) -> ArchiveSegment|None:
+        """
+        Archives ServerStatistic records as a new segment.
+        Records must be newer than everything already archived.
+
+        Args:
+            statistics (list[ServerStatistic]): The records.
+
+        Returns:
+            ArchiveSegment|None: The new segment, or None if there were no records.
+        """
+
+        if len(statistics) == 0:
+            return None
+
+        statistics = sorted(statistics, key = lambda statistic: statistic.time)
+
+        if self.end is not None and statistics[0].time <= self.end:
+            raise ValueError(f"Records must be newer than the archive: {statistics[0].time} <= {self.end}")
+
+        versions = list(dict.fromkeys(statistic.version for statistic in statistics))
+        version_indices = {version : index for index, version in enumerate(versions)}
+
+        encoded = {
+            "time" : self._encode([round(statistic.time * 1000) for statistic in statistics], "q"),
+            "player_count" : self._encode([statistic.player_count for statistic in statistics], "i"),
+            "max_players" : self._encode([statistic.max_players for statistic in statistics], "i"),
+            "version" : self._encode([version_indices[statistic.version] for statistic in statistics], "i")
+        }
+
+        columns = {}
+        blobs = []
+        position = 0
+
+        for name in COLUMNS:
+            blob = zlib.compress(encoded[name], self.compression_level)
+            columns[name] = (position, len(blob))
+
+            blobs.append(blob)
+            position += len(blob)
+
+        with self._lock:
+            with open(self.path, "ab") as file:
+                offset = file.tell() # anything past the last indexed segment is left over from an interrupted append, and is skipped
+                file.write(b"".join(blobs))
+                file.flush()
+                os.fsync(file.fileno())
+
+            segment = ArchiveSegment(
+                offset = offset,
+                start = statistics[0].time,
+                end = statistics[-1].time,
+                count = len(statistics),
+                columns = columns,
+                versions = versions
+            )
+
+            segments = self.segments + [segment]
+            self._save_index(segments)
+            self.segments = segments
+
+        return segment
+
+    def iter_columns(self, start: float, end: float, columns: tuple[str, ...] = COLUMNS) -> Iterator[dict[str, list]]:
+        """
+        Yields archived values recorded between the provided times (inclusive), column by column, one segment at a time.
+        Only the requested columns of the segments overlapping the range are decompressed, and only one segment is held in memory at once.
+
+        Args:
+            start (float): The earliest time.
+            end (float): The latest time.
+            columns (tuple[str, ...], optional): The columns to read. Defaults to every column.
+
+        Yields:
+            dict[str, list]: Each column's values within a segment, oldest first. Times are in seconds, with millisecond precision.
+        """
+
+        segments = [segment for segment in self.segments if segment.end >= start and segment.start <= end]
+
+        if len(segments) == 0:
+            return
+
+        with open(self.path, "rb") as file, mmap.mmap(file.fileno(), 0, access = mmap.ACCESS_READ) as data:
+            for segment in segments:
+                def column(name: str) -> list[int]:
+                    position, length = segment.columns[name]
+                    offset = segment.offset + position
+
+                    return self._decode(zlib.decompress(data[offset:offset + length]), "q" if name == "time" else "i")
+
+                times = [milliseconds / 1000 for milliseconds in column("time")]
+
+                # times are sorted within a segment, so only keep the slice within the range
+                first = bisect.bisect_left(times, start)
+                last = bisect.bisect_right(times, end)
+
+                result = {}
+
+                for name in columns:
+                    if name == "time":
+                        values = times
+                    elif name == "version":
+                        values = [segment.versions[index] for index in column(name)]
+                    else:
+                        values = column(name)
+
+                    result[name] = values[first:last]
+
+                yield result
+
+    def read_columns(self, start: float, end: float, columns: tuple[str, ...] = COLUMNS) -> dict[str, list]:
+        """
+        Returns archived values recorded between the provided times (inclusive), column by column.
+
+        Args:
+            start (float): The earliest time.
+            end (float): The latest time.
+            columns (tuple[str, ...], optional): The columns to read. Defaults to every column.
+
+        Returns:
+            dict[str, list]: Each column's values, oldest first. Times are in seconds, with millisecond precision.
+        """
+
+        result = {name : [] for name in columns}
+
+        for segment in self.iter_columns(start, end, columns):
+            for name in columns:
+                result[name].extend(segment[name])
+
+        return result
+
+    def read(self, start: float, end: float) -> list[ServerStatistic]:
+        """
+        Returns archived records recorded between the provided times (inclusive), as unsaved ServerStatistic objects.
+
+        Args:
+            start (float): The earliest time.
+            end (float): The latest time.
+
+        Returns:
+            list[ServerStatistic]: The records, oldest first.
+        """
+
+        columns = self.read_columns(start, end)
+
+        return [
+            ServerStatistic(time = time, player_count = player_count, max_players = max_players, version = version)
+            for time, player_count, max_players, version in zip(*(columns[name] for name in COLUMNS))
+        ]
@@ -0,0 +1,110 @@
+# // ---------------------------------------------------------------------
+# // ------- [Models] Statistic Export
+# // ---------------------------------------------------------------------
+
+"""
+Streams server statistics out as gzip-compressed CSV or JSONL.
+Repo: https://github.com/cuhHub/ArcheanBot
+
+---
+
+Copyright (C) 2024 Cuh4
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+# ---- // Imports
+from __future__ import annotations
+
+import csv
+import gzip
+import json
+import math
+from typing import BinaryIO, Iterator, Literal
+
+from .server_statistic import ServerStatistic
+from .statistic_archive import StatisticArchive, COLUMNS
+
+# ---- // Variables
+FORMATS = ("csv", "jsonl")
+
+# ---- // Functions
+def iter_statistics(start: float = None, end: float = None, archive: StatisticArchive|None = None) -> Iterator[tuple[float, int, int, str]]:
+    """
+    Yields every ServerStatistic record between the provided times, oldest first, without loading them all into memory.
+    Archived records come first, then records still in the database.
+
+    Args:
+        start (float, optional): The earliest time. Defaults to the beginning.
+        end (float, optional): The latest time. Defaults to now.
+        archive (StatisticArchive|None, optional): The archive to include. Defaults to None.
+
+    Yields:
+        tuple[float, int, int, str]: The time, player count, max players and version of each record.
+    """
+
+    start = -math.inf if start is None else start
+    end = math.inf if end is None else end
+
+    if archive is not None:
+        for segment in archive.iter_columns(start, end):
+            yield from zip(*(segment[name] for name in COLUMNS))
+
+    query = (
+        ServerStatistic.select(ServerStatistic.time, ServerStatistic.player_count, ServerStatistic.max_players, ServerStatistic.version)
+        .where(ServerStatistic.time.between(start, end))
+        .order_by(ServerStatistic.time)
+    )
+
+    # anything still in the database that was also archived is skipped
+    if archive is not None and archive.end is not None:
+        query = query.where(ServerStatistic.time > archive.end)
+
+    # streamed straight from the cursor, nothing is cached
+    yield from query.tuples().iterator()
+
+def export_statistics(file: BinaryIO, format: Literal["csv", "jsonl"], start: float = None, end: float = None, archive: StatisticArchive|None = None) -> int:
+    """
+    Writes ServerStatistic records to a file as gzip-compressed CSV or JSONL, one record at a time.
+
+    Args:
+        file (BinaryIO): The file to write to.
+        format (Literal["csv", "jsonl"]): The format.
+        start (float, optional): The earliest time. Defaults to the beginning.
+        end (float, optional): The latest time. Defaults to now.
+        archive (StatisticArchive|None, optional): The archive to include. Defaults to None.
+
+    Returns:
+        int: The amount of records written.
+    """
+
+    if format not in FORMATS:
+        raise ValueError(f"Unknown export format: {format}")
+
+    count = 0
+
+    with gzip.open(file, "wt", encoding = "utf-8", newline = "") as stream:
+        writer = csv.writer(stream) if format == "csv" else None
+
+        if writer is not None:
+            writer.writerow(COLUMNS)
+
+        for row in iter_statistics(start, end, archive):
+            if writer is not None:
+                writer.writerow(row)
+            else:
+                stream.write(json.dumps(dict(zip(COLUMNS, row))) + "\n")
+
+            count += 1
+
+    return count
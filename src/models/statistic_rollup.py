@@ -0,0 +1,245 @@
+# // ---------------------------------------------------------------------
+# // ------- [Models] Statistic Rollup
+# // ---------------------------------------------------------------------
+
+"""
+Hourly and daily summaries of server statistics, kept up to date as statistics are recorded.
+Repo: https://github.com/cuhHub/ArcheanBot
+
+---
+
+Copyright (C) 2024 Cuh4
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+# ---- // Imports
+from __future__ import annotations
+
+import peewee
+from typing import Iterable
+
+from . import proxy
+from .server_statistic import ServerStatistic
+
+# ---- // Main
+class StatisticRollup(peewee.Model):
+    """
+    A base model summarizing the ServerStatistic records within a fixed-size window of time.
+    Subclasses set `bucket_size`, and each gets its own table.
+    """
+
+    bucket_size: int = 3600
+
+    bucket = peewee.IntegerField(primary_key = True) # the start of the window, as a timestamp
+    samples = peewee.IntegerField()
+    min_player_count = peewee.IntegerField()
+    max_player_count = peewee.IntegerField()
+    total_player_count = peewee.IntegerField()
+    peak_time = peewee.FloatField()
+    peak_max_players = peewee.IntegerField()
+
+    class Meta:
+        database = proxy
+
+    @property
+    def average_player_count(self) -> float:
+        """
+        Returns the average player count within the window.
+
+        Returns:
+            float: The average player count.
+        """
+
+        return self.total_player_count / self.samples
+
+    @classmethod
+    def get_bucket(cls, timestamp: float) -> int:
+        """
+        Returns the start of the window a timestamp falls in.
+
+        Args:
+            timestamp (float): The timestamp.
+
+        Returns:
+            int: The start of the window, as a timestamp.
+        """
+
+        return int(timestamp // cls.bucket_size) * cls.bucket_size
+
+    @classmethod
+    def summarize(cls, statistics: Iterable[ServerStatistic]) -> list[dict[str, any]]:
+        """
+        Summarizes ServerStatistic records into rows for this table, one per window.
+
+        Args:
+            statistics (Iterable[ServerStatistic]): The records.
+
+        Returns:
+            list[dict[str, any]]: The rows.
+        """
+
+        rows: dict[int, dict[str, any]] = {}
+
+        for statistic in statistics:
+            bucket = cls.get_bucket(statistic.time)
+            row = rows.get(bucket)
+
+            if row is None:
+                rows[bucket] = {
+                    "bucket" : bucket,
+                    "samples" : 1,
+                    "min_player_count" : statistic.player_count,
+                    "max_player_count" : statistic.player_count,
+                    "total_player_count" : statistic.player_count,
+                    "peak_time" : statistic.time,
+                    "peak_max_players" : statistic.max_players
+                }
+
+                continue
+
+            row["samples"] += 1
+            row["min_player_count"] = min(row["min_player_count"], statistic.player_count)
+            row["total_player_count"] += statistic.player_count
+
+            if statistic.player_count > row["max_player_count"]:
+                row["max_player_count"] = statistic.player_count
+                row["peak_time"] = statistic.time
+                row["peak_max_players"] = statistic.max_players
+
+        return list(rows.values())
+
+    @classmethod
+    def record(cls, statistics: Iterable[ServerStatistic], database: peewee.Database|None = None) -> int:
+        """
+        Merges ServerStatistic records into this table's summaries, updating each window in place.
+
+        Args:
+            statistics (Iterable[ServerStatistic]): The records. Each record must only be recorded once.
+            database (peewee.Database|None, optional): The database to run the queries on instead of the bound one, e.g. a connection in a transaction. Defaults to None.
+
+        Returns:
+            int: The amount of windows updated.
+        """
+
+        rows = cls.summarize(statistics)
+
+        if len(rows) == 0:
+            return 0
+
+        new_peak = peewee.EXCLUDED.max_player_count > cls.max_player_count
+
+        # chunked to stay under SQLite's variable limit
+        for chunk in peewee.chunked(rows, 100):
+            cls.insert_many(chunk).on_conflict(
+                conflict_target = [cls.bucket],
+                update = {
+                    cls.samples : cls.samples + peewee.EXCLUDED.samples,
+                    cls.min_player_count : peewee.fn.MIN(cls.min_player_count, peewee.EXCLUDED.min_player_count),
+                    cls.max_player_count : peewee.fn.MAX(cls.max_player_count, peewee.EXCLUDED.max_player_count),
+                    cls.total_player_count : cls.total_player_count + peewee.EXCLUDED.total_player_count,
+                    cls.peak_time : peewee.Case(None, [(new_peak, peewee.EXCLUDED.peak_time)], cls.peak_time),
+                    cls.peak_max_players : peewee.Case(None, [(new_peak, peewee.EXCLUDED.peak_max_players)], cls.peak_max_players)
+                }
+            ).execute(database)
+
+        return len(rows)
+
+    @classmethod
+    def get_since(cls, timestamp: float) -> list[StatisticRollup]:
+        """
+        Returns the summaries of every window that ends after the provided time.
+
+        Args:
+            timestamp (float): The time to get summaries from.
+
+        Returns:
+            list[StatisticRollup]: The summaries, oldest first.
+        """
+
+        return list(cls.select().where(cls.bucket >= cls.get_bucket(timestamp)).order_by(cls.bucket))
+
+    @classmethod
+    def get_peak(cls) -> StatisticRollup|None:
+        """
+        Returns the summary with the highest player count.
+
+        Returns:
+            StatisticRollup|None: The summary, or None if there are no summaries.
+        """
+
+        try:
+            return cls.select().order_by(cls.max_player_count.desc(), cls.peak_time).limit(1).get()
+        except peewee.DoesNotExist:
+            return None
+
+    @classmethod
+    def delete_before(cls, timestamp: float) -> int:
+        """
+        Deletes the summaries of windows that started before the provided time.
+
+        Args:
+            timestamp (float): The time.
+
+        Returns:
+            int: The amount of summaries deleted.
+        """
+
+        return cls.delete().where(cls.bucket < cls.get_bucket(timestamp)).execute()
+
+    def as_peak(self) -> ServerStatistic:
+        """
+        Returns an unsaved ServerStatistic record describing the peak of this window.
+
+        Returns:
+            ServerStatistic: The record.
+        """
+
+        return ServerStatistic(
+            time = self.peak_time,
+            player_count = self.max_player_count,
+            max_players = self.peak_max_players,
+            version = ""
+        )
+
+class HourlyStatistic(StatisticRollup):
+    """
+    A model summarizing the ServerStatistic records within an hour.
+    """
+
+    bucket_size = 3600
+
+class DailyStatistic(StatisticRollup):
+    """
+    A model summarizing the ServerStatistic records within a day (UTC).
+    """
+
+    bucket_size = 86400
+
+# ---- // Variables
+ROLLUPS: list[type[StatisticRollup]] = [HourlyStatistic, DailyStatistic]
+
+# ---- // Functions
+def record(statistics: Iterable[ServerStatistic], database: peewee.Database|None = None):
+    """
+    Merges ServerStatistic records into every rollup table.
+
+    Args:
+        statistics (Iterable[ServerStatistic]): The records. Each record must only be recorded once.
+        database (peewee.Database|None, optional): The database to run the queries on instead of the bound one. Defaults to None.
+    """
+
+    statistics = list(statistics)
+
+    for rollup in ROLLUPS:
+        rollup.record(statistics, database)
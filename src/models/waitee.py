@@ -29,7 +29,11 @@ from __future__ import annotations
 import peewee
 import discord
 import time
-from bot import Bot
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from bot import Bot
 
 from . import proxy
 
@@ -39,8 +43,9 @@ class Waitee(peewee.Model):
     A model representing a user waiting for the server to reach a certain player count
     """
 
-    user_id = peewee.IntegerField()
-    wants_player_count = peewee.IntegerField()
+    user_id = peewee.IntegerField(unique = True)
+    wants_player_count = peewee.IntegerField(index = True)
+    at_least = peewee.BooleanField(default = False)
     fallback_channel_id = peewee.IntegerField()
     start_time = peewee.FloatField(default = time.time)
     
@@ -48,7 +53,7 @@ class Waitee(peewee.Model):
         database = proxy
         
     @classmethod
-    def wait_for_count(cls, user: discord.User, player_count: int, channel: discord.TextChannel) -> Waitee:
+    def wait_for_count(cls, user: discord.User, player_count: int, channel: discord.TextChannel, at_least: bool = False) -> Waitee:
         """
         Creates a Waitee record for the provided user.
 
@@ -56,6 +61,7 @@ class Waitee(peewee.Model):
             user (discord.User): The user to create a Waitee record for.
             player_count (int): The player count to wait for.
             channel (discord.TextChannel): The channel to send the reminder to if sending via DMs didn't work.
+            at_least (bool, optional): Whether to remind the user once the player count is at least `player_count`, rather than exactly. Defaults to False.
 
         Returns:
             Waitee: The created Waitee record.
@@ -64,6 +70,7 @@ class Waitee(peewee.Model):
         return cls.create(
             user_id = user.id,
             wants_player_count = player_count,
+            at_least = at_least,
             fallback_channel_id = channel.id
         )
         
@@ -100,35 +107,21 @@ class Waitee(peewee.Model):
             return
         
     @classmethod
-    def get_waitee(cls, user: discord.User) -> Waitee|None:
+    def delete_by_ids(cls, ids: list[int], chunk_size: int = 500) -> int:
         """
-        Returns the Waitee record for the provided user.
+        Deletes the Waitee records with the provided IDs using as few queries as possible.
 
         Args:
-            user (discord.User): The user to retrieve the Waitee record for.
+            ids (list[int]): The IDs of the records to delete.
+            chunk_size (int, optional): The maximum amount of IDs per query, as SQLite limits query parameters. Defaults to 500.
 
         Returns:
-            Waitee|None: The Waitee record for the user, or None if not found.
-        """        
-
-        try:
-            return cls.get(user_id = user.id)
-        except peewee.DoesNotExist:
-            return
-        
-    @classmethod
-    def get_waitees_for_player_count(cls, player_count: int) -> list[Waitee]:
+            int: The amount of records deleted.
         """
-        Returns a list of Waitees waiting for the server to reach the provided player count.
-
-        Args:
-            player_count (int): The player count to check against.
-
-        Returns:
-            list[Waitee]: The list of waitees.
-        """        
-
-        try:
-            return list(cls.select().where(cls.wants_player_count == player_count).execute())
-        except peewee.DoesNotExist:
-            return []
\ No newline at end of file
+        
+        deleted = 0
+        
+        for index in range(0, len(ids), chunk_size):
+            deleted += cls.delete().where(cls.id.in_(ids[index:index + chunk_size])).execute()
+            
+        return deleted
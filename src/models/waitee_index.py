@@ -0,0 +1,280 @@
+# // ---------------------------------------------------------------------
+# // ------- [Models] Waitee Index
+# // ---------------------------------------------------------------------
+
+"""
+An in-memory index of pending Waitee records, bucketed by the player count they want.
+Repo: https://github.com/cuhHub/ArcheanBot
+
+---
+
+Copyright (C) 2024 Cuh4
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+# ---- // Imports
+from __future__ import annotations
+
+import bisect
+
+from .waitee import Waitee
+
+# ---- // Main
+class _TargetBuckets():
+    """
+    Waitee records bucketed by the player count they want, with the player counts kept sorted for range lookups.
+    """
+
+    def __init__(self):
+        """
+        Initializes `_TargetBuckets` class objects.
+        """
+
+        self.buckets: dict[int, dict[int, Waitee]] = {}
+        self.targets: list[int] = []
+
+    def add(self, target: int, waitee: Waitee):
+        """
+        Adds a record under a player count.
+
+        Args:
+            target (int): The player count.
+            waitee (Waitee): The record.
+        """
+
+        if target not in self.buckets:
+            self.buckets[target] = {}
+            bisect.insort(self.targets, target)
+
+        self.buckets[target][waitee.user_id] = waitee
+
+    def remove(self, target: int, user_id: int):
+        """
+        Removes a user's record from under a player count.
+
+        Args:
+            target (int): The player count.
+            user_id (int): The ID of the user.
+        """
+
+        bucket = self.buckets[target]
+        bucket.pop(user_id)
+
+        if len(bucket) == 0:
+            self.buckets.pop(target)
+            self.targets.pop(bisect.bisect_left(self.targets, target))
+
+    def pop_range(self, low: int, high: int) -> list[Waitee]:
+        """
+        Removes and returns every record whose player count is between `low` and `high` (inclusive).
+
+        Args:
+            low (int): The lowest player count.
+            high (int): The highest player count.
+
+        Returns:
+            list[Waitee]: The removed records.
+        """
+
+        start = bisect.bisect_left(self.targets, low)
+        end = bisect.bisect_right(self.targets, high)
+
+        waitees = []
+
+        for target in self.targets[start:end]:
+            waitees.extend(self.buckets.pop(target).values())
+
+        del self.targets[start:end]
+        return waitees
+
+    def has_range(self, low: int, high: int) -> bool:
+        """
+        Returns whether or not any record's player count is between `low` and `high` (inclusive).
+
+        Args:
+            low (int): The lowest player count.
+            high (int): The highest player count.
+
+        Returns:
+            bool: True if there is at least one.
+        """
+
+        return bisect.bisect_left(self.targets, low) < bisect.bisect_right(self.targets, high)
+
+    def clear(self):
+        """
+        Removes every record.
+        """
+
+        self.buckets.clear()
+        self.targets.clear()
+
+class WaiteeIndex():
+    """
+    An in-memory index of pending Waitee records, sorted by the player count they want.
+    The database is only used for persistence, while lookups are served from here.
+
+    Finding who to notify when the player count moves from `a` to `b` is a binary search over the player counts crossed, so nobody is missed if the count jumps past their target between polls.
+    """
+
+    def __init__(self):
+        """
+        Initializes `WaiteeIndex` class objects.
+        """
+
+        self.exact = _TargetBuckets()
+        self.at_least = _TargetBuckets()
+
+        self.users: dict[int, Waitee] = {}
+        self.indexed_under: dict[int, tuple[bool, int]] = {}
+
+    def __len__(self) -> int:
+        return len(self.users)
+
+    def load(self, waitees: list[Waitee]):
+        """
+        Loads Waitee records into the index, replacing anything already indexed.
+
+        Args:
+            waitees (list[Waitee]): The records, usually every record in the database.
+        """
+
+        self.exact.clear()
+        self.at_least.clear()
+        self.users.clear()
+        self.indexed_under.clear()
+
+        for waitee in waitees:
+            self.add(waitee)
+
+    def add(self, waitee: Waitee):
+        """
+        Adds a Waitee record to the index. Replaces the user's existing record, if any.
+        Must be called again after a record's `wants_player_count` or `at_least` is changed.
+
+        Args:
+            waitee (Waitee): The Waitee record.
+        """
+
+        self.remove(waitee.user_id)
+
+        buckets = self.at_least if waitee.at_least else self.exact
+        buckets.add(waitee.wants_player_count, waitee)
+
+        self.users[waitee.user_id] = waitee
+        self.indexed_under[waitee.user_id] = (waitee.at_least, waitee.wants_player_count)
+
+    def remove(self, user_id: int) -> Waitee|None:
+        """
+        Removes a user's Waitee record from the index.
+
+        Args:
+            user_id (int): The ID of the user.
+
+        Returns:
+            Waitee|None: The removed record, or None if the user wasn't indexed.
+        """
+
+        waitee = self.users.pop(user_id, None)
+
+        if waitee is None:
+            return None
+
+        # the record may have been modified since it was indexed, so use what it was indexed under
+        at_least, target = self.indexed_under.pop(user_id)
+        buckets = self.at_least if at_least else self.exact
+        buckets.remove(target, user_id)
+
+        return waitee
+
+    def get(self, user_id: int) -> Waitee|None:
+        """
+        Returns a user's Waitee record.
+
+        Args:
+            user_id (int): The ID of the user.
+
+        Returns:
+            Waitee|None: The record, or None if the user isn't waiting.
+        """
+
+        return self.users.get(user_id)
+
+    def _forget(self, waitees: list[Waitee]) -> list[Waitee]:
+        """
+        Removes popped records from the user lookups.
+
+        Args:
+            waitees (list[Waitee]): The popped records.
+
+        Returns:
+            list[Waitee]: The same records.
+        """
+
+        for waitee in waitees:
+            self.users.pop(waitee.user_id)
+            self.indexed_under.pop(waitee.user_id)
+
+        return waitees
+
+    def pop_crossed(self, previous_count: int, count: int) -> list[Waitee]:
+        """
+        Removes and returns the Waitee records whose target was reached when the player count moved from `previous_count` to `count`.
+        Exact reminders are reached by crossing their target in either direction, "at least" reminders only by going up.
+
+        Args:
+            previous_count (int): The previous player count.
+            count (int): The new player count.
+
+        Returns:
+            list[Waitee]: The removed records.
+        """
+
+        if count > previous_count:
+            waitees = self.exact.pop_range(previous_count + 1, count) + self.at_least.pop_range(previous_count + 1, count)
+        elif count < previous_count:
+            waitees = self.exact.pop_range(count, previous_count - 1)
+        else:
+            waitees = []
+
+        return self._forget(waitees)
+
+    def pop_reached(self, count: int) -> list[Waitee]:
+        """
+        Removes and returns the Waitee records satisfied by the provided player count, without knowing the previous count.
+        Used when there is no previous count to compare against, e.g. on startup.
+
+        Args:
+            count (int): The player count.
+
+        Returns:
+            list[Waitee]: The removed records.
+        """
+
+        waitees = self.exact.pop_range(count, count) + self.at_least.pop_range(0, count)
+        return self._forget(waitees)
+
+    def has_target_near(self, count: int, distance: int) -> bool:
+        """
+        Returns whether or not any Waitee record could be reached by the player count moving up to `distance` away from `count`.
+
+        Args:
+            count (int): The current player count.
+            distance (int): How far the player count may move.
+
+        Returns:
+            bool: True if any record is that close to being reached.
+        """
+
+        return self.exact.has_range(count - distance, count + distance) or self.at_least.has_range(count + 1, count + distance)